@@ -1,21 +1,82 @@
-import plotly.graph_objects as go
+import numpy as np
 import pandas as pd
+from .FilterIndex import FilterIndex, filter_mask
+from .PolarsEngine import PolarsEngine, resolve_engine, to_pandas, to_output
+from .SqlSource import SqlSource
+from .ParquetSource import ParquetSource
+from .CategoryRollup import CategoryRollup
+from .PlotCache import cached_plot, frame_fingerprint
+from .FigureBuilder import FigureBuilder
+from .TraceFactory import cycle_color, dense_matrix
+from .TopN import check_top_n, top_n_keys, fold_keys
+from .Schema import normalize_frame, widen, as_str
+from .Profiler import profile_stage, profiled
+
+# Aggregations whose per-group results fold into a larger group with another reduction, for top_n on engines
+FOLDABLE_AGGS = {"sum": "sum", "count": "sum", "min": "min", "max": "max"}
 
 class CatBarPlot:
-    def __init__(self, df, title=""):
-        self.df = df.copy()
+    def __init__(self, df, title="", copy=True, engine=None, cache=None, validate=True, dimensions=None,
+                 downcast=False, profiler=None):
+        # A SqlSource, ParquetSource, CategoryRollup or engine='polars' (the default for polars/pyarrow
+        # input) runs filtering and the groupby at the source, on the rollup or as a polars query;
+        # otherwise plot() never mutates self.df and copy=False wraps the caller's frame without copying it
+        self.engine = None
+        if isinstance(df, (SqlSource, ParquetSource, CategoryRollup)):
+            self.engine = df
+            self.df = None
+        elif resolve_engine(df, engine) == 'polars':
+            self.engine = PolarsEngine(df)
+            self.df = None
+        else:
+            converted = to_pandas(df)
+            self.df = df.copy() if copy and converted is df else converted
+            if dimensions or downcast:
+                # Label, segment and filter columns become categoricals (and integers narrow) once, here
+                self.df = normalize_frame(self.df, dimensions or (), downcast)
+            self.filter_index = FilterIndex(self.df)
         self.title = title
+        # Optional PlotCache (or DiskCache) shared across plotters; plot() results are then looked up before computing
+        self.cache = cache
+        # Optional Profiler recording the time, rows and memory of every stage of plot() and aggregate()
+        self.profiler = profiler
+        self._fingerprint = None
+        # validate=False assembles figures from a once-validated layout without per-call validation
+        self.figures = FigureBuilder(validate)
         self.colors = ["#ae37ff","#ab8bff","#bbc6e2","#8fb3e0","#98c8d9","#92e4c3","#91de73","#bdf07f","#e5f993"]
         self.title_dict = dict(text=title.title(), font=dict(color="#AE37FF"), x=0)
         self.margins = dict(l=45, r=0, t=35, b=35)
 
-    def _apply_filters(self, df, filters):
-        if filters is None: return df
+    @classmethod
+    def from_chunks(cls, chunks, title="", dimensions=(), value_cols=(), weight_cols=None, cache=None,
+                    validate=True, profiler=None):
+        # Reduces an iterable of DataFrame chunks (e.g. pd.read_csv(..., chunksize=...)) into a CategoryRollup
+        # one chunk at a time; labels, segments and filters must then be dimensions
+        return cls(CategoryRollup(chunks, dimensions, value_cols, weight_cols), title, cache=cache, validate=validate,
+                   profiler=profiler)
+
+    @classmethod
+    def from_parquet(cls, path, title="", partitioning='hive', cache=None, validate=True, profiler=None):
+        # Reads only the label, value, segment and weight columns, with the filters pushed down to pyarrow
+        return cls(ParquetSource(path, partitioning=partitioning), title, cache=cache, validate=validate,
+                   profiler=profiler)
+
+    def data_fingerprint(self):
+        # A cheap fingerprint of the data for the plot() cache, or None if it has none
+        if self.df is None: return self.engine.fingerprint()
+        if self._fingerprint is None: self._fingerprint = frame_fingerprint(self.df)
+        return self._fingerprint
+
+    def _check_filters(self, filters, columns):
+        if filters is None: return
         if not isinstance(filters, dict): raise ValueError("filters must be a dict of {col: list_of_values}.")
-        for col, values in filters.items():
-            if col not in df.columns: raise ValueError(f"Column '{col}' not found in DataFrame.")
-            df = df[df[col].isin(values)]
-        return df
+        for col in filters:
+            if col not in columns: raise ValueError(f"Column '{col}' not found in DataFrame.")
+
+    def _apply_filters(self, df, filters):
+        self._check_filters(filters, df.columns)
+        if not filters: return df
+        return df[filter_mask(df, filters, self.filter_index if df is self.df else None)]
 
     def _apply_sorting(self, df, sorting, reverse):
         if isinstance(sorting, list):
@@ -34,88 +95,182 @@ class CatBarPlot:
 
     def _make_trace_with_orientation(self, df, orientation):
         if orientation == "v":
-            return go.Bar(x=df["label"], y=df["value"], marker_color=self.colors[0], showlegend=False,
-                          hovertemplate="label=%{x}<br>value=%{y}<extra></extra>")
+            return dict(type="bar", x=df["label"], y=df["value"], marker=dict(color=self.colors[0]), showlegend=False,
+                        hovertemplate="label=%{x}<br>value=%{y}<extra></extra>")
         if orientation == "h":
-            return go.Bar(x=df["value"], y=df["label"], marker_color=self.colors[0], showlegend=False, orientation="h",
-                          hovertemplate="label=%{y}<br>value=%{x}<extra></extra>")
+            return dict(type="bar", x=df["value"], y=df["label"], marker=dict(color=self.colors[0]), showlegend=False,
+                        orientation="h", hovertemplate="label=%{y}<br>value=%{x}<extra></extra>")
         raise ValueError("orientation must be 'v' or 'h'.")
 
+    def _segment_matrix(self, df, labels_order, seg_order):
+        # One label x segment matrix for every segment's trace; labels a segment lacks are 0
+        return np.asarray(labels_order, dtype=object), dense_matrix(df, "label", "segment", "value", labels_order, seg_order)
+
     def _make_stacked_traces(self, df, labels_order, orientation, seg_order):
+        labels, matrix = self._segment_matrix(df, labels_order, seg_order)
         traces = []
         for i, s in enumerate(seg_order):
-            sub = df[df["segment"] == s].set_index("label").reindex(labels_order, fill_value=0).reset_index()
             if orientation == "v":
-                tr = go.Bar(name=str(s), x=sub["label"], y=sub["value"],
-                            marker_color=self.colors[i % len(self.colors)], showlegend=True)
+                tr = dict(type="bar", name=str(s), x=labels, y=matrix[:, i],
+                          marker=dict(color=cycle_color(self.colors, i)), showlegend=True)
             else:
-                tr = go.Bar(name=str(s), x=sub["value"], y=sub["label"], orientation="h",
-                            marker_color=self.colors[i % len(self.colors)], showlegend=True)
+                tr = dict(type="bar", name=str(s), x=matrix[:, i], y=labels, orientation="h",
+                          marker=dict(color=cycle_color(self.colors, i)), showlegend=True)
             traces.append(tr)
         return traces
 
     def _make_grouped_traces(self, df, labels_order, orientation, seg_order):
+        labels, matrix = self._segment_matrix(df, labels_order, seg_order)
         traces = []
         for i, s in enumerate(seg_order):
-            sub = df[df["segment"] == s].set_index("label").reindex(labels_order, fill_value=0).reset_index()
             if orientation == "v":
-                tr = go.Bar(x=sub["label"], y=sub["value"],
-                            marker_color=self.colors[i % len(self.colors)], showlegend=False,
-                            hovertemplate=f"label=%{{x}}<br>segment={s}<br>value=%{{y}}<extra></extra>")
+                tr = dict(type="bar", x=labels, y=matrix[:, i],
+                          marker=dict(color=cycle_color(self.colors, i)), showlegend=False,
+                          hovertemplate=f"label=%{{x}}<br>segment={s}<br>value=%{{y}}<extra></extra>")
             else:
-                tr = go.Bar(x=sub["value"], y=sub["label"], orientation="h",
-                            marker_color=self.colors[i % len(self.colors)], showlegend=False,
-                            hovertemplate=f"label=%{{y}}<br>segment={s}<br>value=%{{x}}<extra></extra>")
+                tr = dict(type="bar", x=matrix[:, i], y=labels, orientation="h",
+                          marker=dict(color=cycle_color(self.colors, i)), showlegend=False,
+                          hovertemplate=f"label=%{{y}}<br>segment={s}<br>value=%{{x}}<extra></extra>")
             traces.append(tr)
         return traces
 
     def _apply_aggregation(self, df, agg="sum"):
         group_cols = ["label"] + (["segment"] if "segment" in df.columns else [])
         if isinstance(agg, str) and agg.startswith(("wmean:","weighted_mean:")):
-            tmp = df.assign(_w=df['wc'], _wv=df["value"]*df['wc'])
-            out = tmp.groupby(group_cols, as_index=False)[["_wv","_w"]].sum()
+            tmp = df.assign(_w=df['wc'], _wv=widen(df["value"])*widen(df['wc']))
+            out = tmp.groupby(group_cols, as_index=False, observed=True)[["_wv","_w"]].sum()
             out["value"] = out["_wv"] / out["_w"]
-            return out[group_cols + ["value"]]
-        out = df.groupby(group_cols, as_index=False)["value"].agg(agg or "sum")
-        out.columns = group_cols + ["value"]
-        return out
+            out = out[group_cols + ["value"]]
+        else:
+            out = df.groupby(group_cols, as_index=False, observed=True)["value"].agg(agg or "sum")
+            out.columns = group_cols + ["value"]
+        # Categorical keys come back as plain strings, as without normalization
+        categorical = [c for c in group_cols if isinstance(out[c].dtype, pd.CategoricalDtype)]
+        return out.assign(**{c: out[c].astype(str) for c in categorical})
 
     def _build_template(self, df, label_col, value_col, agg, segment):
-        out = pd.DataFrame({"label": df[label_col].astype(str), "value": df[value_col].values})
+        out = pd.DataFrame({"label": as_str(df[label_col]), "value": df[value_col].values})
         if segment is not None:
             if segment not in df.columns: raise ValueError(f"Column '{segment}' not found in DataFrame.")
-            out["segment"] = df[segment].astype(str).values
+            out["segment"] = as_str(df[segment]).values
         if isinstance(agg, str) and agg.startswith(("wmean:","weighted_mean:")):
             wc_col = agg.split(":", 1)[1]
             if wc_col not in df.columns: raise ValueError(f"Weighted mean column '{wc_col}' not found in DataFrame.")
             out["wc"] = df[wc_col].values
         return out
 
+    def _fold_labels(self, df, agg, top_n, other_label):
+        # Relabels the template rows of every label past the top_n (by its value over all segments),
+        # so aggregating afterwards is exact whatever agg is
+        ranking = self._apply_aggregation(df.drop(columns="segment", errors="ignore"), agg)
+        top = top_n_keys(ranking["label"], ranking["value"].to_numpy(), top_n)
+        if top is None: return df
+        return df.assign(label=fold_keys(df["label"], top, other_label))
+
+    def _fold_partials(self, out, keys, fold, top_n, other_label):
+        # Engines return final values, so labels past the top_n are folded from partials that add up:
+        # sums and counts, min/max, or sum(value*weight) and sum(weight) for (weighted) means
+        parts = [c for c in ("_num", "_den") if c in out.columns]
+        finish = lambda g: g["_num"] / g["_den"] if "_den" in g else g["_num"]
+        ranking = out.groupby("label", dropna=False)[parts].agg(fold)
+        top = top_n_keys(ranking.index, finish(ranking).to_numpy(), top_n)
+        if top is not None:
+            out = (out.assign(label=fold_keys(out["label"], top, other_label))
+                   .groupby(keys, as_index=False, dropna=False)[parts].agg(fold))
+        return out[keys].assign(value=finish(out))
+
+    def _engine_partials(self, keys, value_col, agg, filters, weight_col):
+        # The engine's partial aggregates for _fold_partials and the reduction that combines them
+        if weight_col is not None:
+            out = self.engine.aggregate(keys, value_col, agg, filters, weight_col)
+            weights = self.engine.aggregate(keys, weight_col, "sum", filters).rename(columns={"value": "_den"})
+            out = out.merge(weights, on=list(keys))
+            return out.assign(_num=out["value"] * out["_den"]), "sum"
+        if agg == "mean":
+            sums = self.engine.aggregate(keys, value_col, "sum", filters).rename(columns={"value": "_num"})
+            counts = self.engine.aggregate(keys, value_col, "count", filters).rename(columns={"value": "_den"})
+            return sums.merge(counts, on=list(keys)), "sum"
+        if agg in FOLDABLE_AGGS:
+            out = self.engine.aggregate(keys, value_col, agg, filters).rename(columns={"value": "_num"})
+            return out, FOLDABLE_AGGS[agg]
+        raise ValueError(f"top_n needs agg to be one of {', '.join(map(repr, ('mean',) + tuple(FOLDABLE_AGGS)))} "
+                         f"or 'wmean:<col>' with a {type(self.engine).__name__}.")
+
+    def _aggregate_with_engine(self, label_col, value_col, agg, filters, segment, top_n=None, other_label="Other"):
+        # Same result as _build_template + _apply_aggregation, computed by the engine, database or rollup
+        self._check_filters(filters, self.engine.columns)
+        keys = {"label": label_col, **({"segment": segment} if segment is not None else {})}
+        weight_col = None
+        if isinstance(agg, str) and agg.startswith(("wmean:","weighted_mean:")):
+            weight_col = agg.split(":", 1)[1]
+            if weight_col not in self.engine.columns: raise ValueError(f"Weighted mean column '{weight_col}' not found in DataFrame.")
+        if top_n is None:
+            out = self.engine.aggregate(keys, value_col, agg or "sum", filters, weight_col)
+        else:
+            partials, fold = self._engine_partials(keys, value_col, agg or "sum", filters, weight_col)
+            for key in keys:
+                partials[key] = partials[key].astype(str)
+            out = self._fold_partials(partials, list(keys), fold, top_n, other_label)
+        for key in keys:
+            out[key] = out[key].astype(str)
+        return out.sort_values(list(keys), ignore_index=True)
+
+    @profiled
+    def aggregate(self, label_col, value_col, agg=None, filters=None, segment=None, output="pandas",
+                  top_n=None, other_label="Other"):
+        # plot()'s filtering and groupby without the figure: one row per label (and segment) with its
+        # 'value'; output='arrow' returns a pyarrow Table instead of a DataFrame. With top_n, labels
+        # past the top_n by value are aggregated together as other_label
+        check_top_n(top_n)
+        if self.engine is not None:
+            with profile_stage(self, "query") as stage:
+                df = stage.out(self._aggregate_with_engine(label_col, value_col, agg, filters, segment, top_n, other_label))
+        else:
+            with profile_stage(self, "filter", self.df) as stage:
+                df = stage.out(self._apply_filters(self.df, filters))
+            with profile_stage(self, "template", df) as stage:
+                df = stage.out(self._build_template(df, label_col, value_col, agg, segment))
+            if top_n is not None:
+                with profile_stage(self, "top_n", df) as stage:
+                    df = stage.out(self._fold_labels(df, agg, top_n, other_label))
+            with profile_stage(self, "aggregate", df) as stage:
+                df = stage.out(self._apply_aggregation(df, agg))
+        return to_output(df, output)
+
+    @profiled
+    @cached_plot
     def plot(self, label_col, value_col, agg=None, sorting=None, reverse=False,
-             figsize=(None, None), orientation="v", filters=None, segment=None, segment_mode="stack"):
-        df = self.df.copy()
-        df = self._apply_filters(df, filters)
-        df = self._build_template(df, label_col, value_col, agg, segment)
-        df = self._apply_aggregation(df, agg)
+             figsize=(None, None), orientation="v", filters=None, segment=None, segment_mode="stack",
+             top_n=None, other_label="Other"):
+        df = self.aggregate(label_col, value_col, agg, filters, segment, top_n=top_n, other_label=other_label)
+        if top_n is not None and isinstance(sorting, list):
+            # A custom order covers the labels left after folding, with other_label last unless placed
+            kept = set(df["label"])
+            sorting = [x for x in sorting if str(x) in kept]
+            if other_label in kept and other_label not in [str(x) for x in sorting]:
+                sorting.append(other_label)
 
         if segment is None:
-            df = self._apply_sorting(df, sorting, reverse)
+            with profile_stage(self, "sort", df) as stage:
+                df = stage.out(self._apply_sorting(df, sorting, reverse))
             trace = self._make_trace_with_orientation(df, orientation)
-            fig = go.Figure(trace)
-            fig.update_layout(title=self.title_dict, margin=self.margins, width=figsize[0], height=figsize[1])
-            return fig
+            with profile_stage(self, "figure"):
+                return self.figures.figure([trace], dict(title=self.title_dict, margin=self.margins,
+                                                         width=figsize[0], height=figsize[1])), df
 
-        totals = df.groupby("label", as_index=False)["value"].sum()
-        totals = self._apply_sorting(totals, sorting, reverse)
-        labels_order = totals["label"].tolist()
+        with profile_stage(self, "sort", df) as stage:
+            totals = df.groupby("label", as_index=False)["value"].sum()
+            totals = stage.out(self._apply_sorting(totals, sorting, reverse))
+            labels_order = totals["label"].tolist()
 
-        seg_totals = df.groupby("segment", as_index=False)["value"].sum().sort_values("value", ascending=False)
-        seg_order = seg_totals["segment"].astype(str).tolist()
+            seg_totals = df.groupby("segment", as_index=False)["value"].sum().sort_values("value", ascending=False)
+            seg_order = seg_totals["segment"].astype(str).tolist()
 
         if segment_mode not in ("stack","group"): raise ValueError("segment_mode must be 'stack' or 'group'.")
-        traces = (self._make_stacked_traces if segment_mode=="stack" else self._make_grouped_traces)(df, labels_order, orientation, seg_order)
+        with profile_stage(self, "traces", df):
+            traces = (self._make_stacked_traces if segment_mode=="stack" else self._make_grouped_traces)(df, labels_order, orientation, seg_order)
 
-        fig = go.Figure(traces)
-        fig.update_layout(barmode=("stack" if segment_mode=="stack" else "group"),
-                          title=self.title_dict, margin=self.margins, width=figsize[0], height=figsize[1])
-        return fig
+        with profile_stage(self, "figure"):
+            return self.figures.figure(traces, dict(barmode=("stack" if segment_mode=="stack" else "group"),
+                                                    title=self.title_dict, margin=self.margins,
+                                                    width=figsize[0], height=figsize[1])), df
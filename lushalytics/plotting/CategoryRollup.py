@@ -0,0 +1,81 @@
+import pandas as pd
+from .DateRollup import aggregate_chunks, merge_partials, sum_name, count_name, wsum_name
+from .FilterIndex import filter_mask
+from .PlotCache import frame_fingerprint
+
+
+class CategoryRollup:
+    """
+    Additive partial aggregates keyed by category columns only, the CatBarPlot counterpart of DateRollup.
+
+    The rollup holds, per combination of the dimension columns, the sum and non-null count of every
+    value column and, for every value/weight pair, the weighted sum and the weight. CatBarPlot accepts
+    it in place of a DataFrame; labels, segments and filters may only use dimension columns, and agg
+    may be 'sum', 'mean', 'count' or 'wmean:<weight column>'.
+
+    Parameters:
+    -----------
+    df : pandas.DataFrame or iterable of pandas.DataFrame
+        The raw data, or chunks of it that are aggregated one at a time.
+    dimensions : list
+        Columns that can later be used as labels, segments and filters.
+    value_cols : list
+        Columns that can later be aggregated.
+    weight_cols : list, optional, default=None
+        Columns that can weight the value columns for 'wmean:<col>'.
+    """
+
+    AGGS = ('sum', 'mean', 'count')
+
+    def __init__(self, df, dimensions, value_cols, weight_cols=None):
+
+        self.dimensions = list(dimensions)
+        self.weight_cols = list(weight_cols or [])
+        self.value_cols = list(dict.fromkeys(list(value_cols) + self.weight_cols))
+        self.weighted = [(v, w) for w in self.weight_cols for v in self.value_cols if v != w]
+        self.columns = self.dimensions + self.value_cols
+
+        self.partials = aggregate_chunks(
+            df,
+            lambda chunk: self.dimensions,
+            self.dimensions,
+            sum_cols=self.value_cols,
+            count_cols=self.value_cols,
+            weighted=self.weighted
+        )
+
+    def fingerprint(self):
+        """A fingerprint of the whole rollup, for the plot() cache."""
+        return frame_fingerprint(self.partials, sample_rows=len(self.partials))
+
+    def aggregate(self, keys, value_col, agg='sum', filters=None, weight_col=None):
+        """
+        Groups the filtered partials by keys (a dict of output name -> dimension column) and reduces
+        value_col into a 'value' column with agg, or to its weighted mean by weight_col.
+        """
+        for col in list(keys.values()) + list(filters or {}):
+            if col not in self.dimensions:
+                raise ValueError(f"Column '{col}' is not a dimension of this rollup.")
+        if value_col not in self.value_cols:
+            raise ValueError(f"Column '{value_col}' is not a value column of this rollup.")
+        if weight_col is not None:
+            if (value_col, weight_col) not in self.weighted:
+                raise ValueError(f"Column '{value_col}' is not weighted by '{weight_col}' in this rollup.")
+            parts = [wsum_name(value_col, weight_col), sum_name(weight_col)]
+        elif agg in self.AGGS:
+            parts = [sum_name(value_col), count_name(value_col)]
+        else:
+            raise ValueError(f"agg must be one of {', '.join(map(repr, self.AGGS))} or 'wmean:<col>' with a CategoryRollup.")
+
+        p = self.partials
+        if filters:
+            p = p[filter_mask(p, filters)]
+        by = list(dict.fromkeys(keys.values()))
+        merged = merge_partials([p[by + parts]], by)
+
+        out = pd.DataFrame({name: merged[col] for name, col in keys.items()})
+        if weight_col is not None or agg == 'mean':
+            out['value'] = merged[parts[0]] / merged[parts[1]]
+        else:
+            out['value'] = merged[parts[0] if agg == 'sum' else parts[1]]
+        return out
@@ -1,51 +1,67 @@
 import plotly.graph_objects as go
 from .DatePlottingSuper import DatePlotter
-import pandas as pd 
+from .DateRollup import partial_aggregate, finalize_partials
+from .PlotCache import cached_plot
+from .PolarsEngine import to_output
+from .Downsample import check_max_points, lttb_indices
+from .TraceFactory import cycle_color, segment_positions
+from .TopN import check_top_n, check_other_label, fold_keys, folded_order
+from .Schema import as_str
+from .Profiler import profile_stage, profiled
+import pandas as pd
+import numpy as np
 
 class DateLinePlotter(DatePlotter):
 
-    def __init__(self, df, title):
+    # plot() leaves its aggregated frame on this attribute for inspection only: it is shared by every call on
+    # the plotter (the last writer wins across threads), so library code never reads it; use aggregate().
+    result_attr = '_test'
 
-        super().__init__(df, title)
+    def __init__(self, df, title, copy=True, date_col=None, engine=None, cache=None, validate=True, dimensions=None,
+                 downcast=False, profiler=None):
+
+        super().__init__(df, title, copy=copy, date_col=date_col, engine=engine, cache=cache, validate=validate,
+                         dimensions=dimensions, downcast=downcast, profiler=profiler)
         
 
-    def add_scatter_trace(self, fig, df, x_name, y_name, name, color, hover_text):
-        fig.add_trace(go.Scatter(
+    def scatter_trace(self, df, x_name, y_name, name, color, hover_text, webgl=False):
+        # hover_text is either pre-rendered text or a (customdata, hovertemplate) pair
+        if isinstance(hover_text, tuple):
+            hover = dict(customdata=hover_text[0], hovertemplate=hover_text[1])
+        else:
+            hover = dict(hovertext=hover_text, hovertemplate='%{hovertext}<extra></extra>')
+        if webgl:
+            # Straight lines without markers keep long WebGL traces cheap to draw
+            return dict(
+                type='scattergl',
+                x=df[x_name],
+                y=df[y_name],
+                mode='lines',
+                line=dict(color=color, width=2),
+                name=name.replace("_", " "),
+                **hover
+            )
+        return dict(
+            type='scatter',
             x=df[x_name],
             y=df[y_name],
             mode='lines+markers',
-            line=dict(color=color, width=4),
-            marker=dict(size=10),  
-            line_shape='spline',
+            line=dict(color=color, width=4, shape='spline'),
+            marker=dict(size=10),
             name=name.replace("_", " "),
-            hovertext=hover_text,
-            hovertemplate='%{hovertext}<extra></extra>'
-        ))
-
-    def _create_trace_tooltip(self, trace_df, granularity, trace_name, value_col, other_cols_to_include=None):
-        """Generates a formatted hover tooltip for a specific trace."""
+            **hover
+        )
 
-        trace_df = trace_df.copy()
-        trace_df['period_start'] = pd.to_datetime(trace_df['period_start'])
-        trace_df['period_end'] = pd.to_datetime(trace_df['period_end'])
+    def _create_trace_tooltip(self, trace_df, granularity, trace_name, value_col, other_cols_to_include=None, raw=False):
+        """Generates a formatted hover tooltip for a specific trace (a (customdata, hovertemplate) pair if raw)."""
 
-        if granularity != 'daily':
-            date_part = trace_df['period_start'].dt.strftime('%b %d') + ' → ' + trace_df['period_end'].dt.strftime('%b %d, %Y')
-        else:
-            date_part = trace_df['period_start'].dt.strftime('%b %d, %Y')
-            
-        trace_name_title = self.convert_str_2_title(trace_name)
-        value_formatted = trace_df[value_col].round(2).apply(lambda x: f"{x:,.2f}" if isinstance(x, float) else f"{x:,}")
-        hover_text = date_part + '<br>' + trace_name_title + ': ' + value_formatted.astype(str)
-        
+        fields = [(self.convert_str_2_title(trace_name), value_col)]
         if other_cols_to_include:
-            for col in other_cols_to_include:
-                if col in trace_df.columns:
-                    col_title = self.convert_str_2_title(col)
-                    col_val = trace_df[col].round(2).apply(lambda x: f"{x:,.2f}" if isinstance(x, float) else f"{x:,}")
-                    hover_text = hover_text + '<br>' + col_title + ': ' + col_val.astype(str)
+            fields += [(self.convert_str_2_title(col), col) for col in other_cols_to_include if col in trace_df.columns]
 
-        return hover_text
+        if raw:
+            return self.build_hover_customdata(trace_df, granularity, fields)
+        return self.build_hover_text(trace_df, granularity, fields)
 
     def test_parameters_for_complience(
         self,
@@ -74,7 +90,59 @@ class DateLinePlotter(DatePlotter):
                 if not ok:
                     raise ValueError("count_col list must match target_col list length")
     
-    def plot(
+    def target_and_count_cols(self, target_col, count_col):
+        """Returns target_col as a list and the count column paired with each target (empty if none)."""
+        target_cols = [target_col] if isinstance(target_col, str) else target_col
+        all_count_cols = []
+        if isinstance(count_col, str):
+            all_count_cols = [count_col]*len(target_cols)
+        elif isinstance(count_col, list):
+            all_count_cols = count_col
+        return target_cols, all_count_cols
+
+    def daily_values(self, date_col, filters, days_back, segment_col, aggregator, target_cols, all_count_cols,
+                     granularity, now=None):
+        """The filtered, trimmed values aggregated per day (or hour) and segment, before the period stage."""
+        if self.df is None:
+            # Daily values come straight from the rollup's partial aggregates or the polars engine
+            agg_df = self.read_daily(
+                date_col, filters, days_back, segment_col,
+                sums=list(dict.fromkeys((target_cols if aggregator == 'sum' else []) + all_count_cols)),
+                means=target_cols if aggregator == 'avg' else [],
+                weighted=list(zip(target_cols, all_count_cols)) if aggregator == 'weighted_avg' else [],
+                granularity=granularity,
+                now=now
+            )
+        else:
+            df = self.select_rows(filters, days_back, date_col, now)
+            with profile_stage(self, 'aggregate', df) as stage:
+                if granularity == 'hourly':
+                    # Hours are the base unit here, so the aggregator works on hourly buckets directly
+                    df = df.assign(**{date_col: df[date_col].dt.floor('h')})
+
+                group_cols = [date_col] + ([segment_col] if segment_col else [])
+
+                if aggregator == 'sum':
+                    agg_dict = {col: 'sum' for col in target_cols}
+                    agg_dict.update({col: 'sum' for col in all_count_cols})
+                    agg_df = df.groupby(group_cols, as_index=False, observed=True).agg(agg_dict)
+                elif aggregator == 'avg':
+                    agg_dict = {col: 'mean' for col in target_cols}
+                    if all_count_cols:
+                        agg_dict.update({col: 'sum' for col in all_count_cols})
+                    agg_df = df.groupby(group_cols, as_index=False, observed=True).agg(agg_dict)
+                elif aggregator == 'weighted_avg':
+                    # One grouped reduction of sum(x*w) and sum(w) for every target/count pair
+                    pairs = list(zip(target_cols, all_count_cols))
+                    counts = list(dict.fromkeys(all_count_cols))
+                    partials = partial_aggregate(df, group_cols, sum_cols=counts, weighted=pairs)
+                    agg_df = finalize_partials(partials, group_cols, sums=counts, weighted=pairs)
+                stage.out(agg_df)
+
+        return agg_df
+
+    @profiled
+    def aggregate(
         self,
         date_col,
         target_col,
@@ -87,101 +155,135 @@ class DateLinePlotter(DatePlotter):
         granularity='daily',
         incomplete_drop=False,
         days_back=30,
-        figsize=[700, 271],
-        y_range=None
+        now=None,
+        output='pandas',
+        top_n=None,
+        other_label='Other'
     ):
+        """
+        Runs plot()'s filtering, trimming, granularity and aggregation stages and returns the result
+        as a tidy frame, one row per period (and segment), without building tooltips or a figure.
+        Takes plot()'s data arguments; output='arrow' returns a pyarrow Table instead of a DataFrame.
+        With top_n, only the top_n segments by their aggregated target over the whole window (its sum,
+        mean of daily values or weighted mean, per aggregator) keep their own rows; the rest are
+        aggregated together under other_label. top_n requires segment_col.
+        """
 
-        target_cols = [target_col] if isinstance(target_col, str) else target_col
-        # We need the list of count columns for tooltip generation later
-        all_count_cols = []
-        if isinstance(count_col, str):
-            all_count_cols = [count_col]*len(target_cols)
-        elif isinstance(count_col, list):
-            all_count_cols = count_col
+        target_cols, all_count_cols = self.target_and_count_cols(target_col, count_col)
 
         self.test_parameters_for_complience(
             aggregator, segment_col, target_cols, all_count_cols,
             period_aggregator, count_period_aggregator
         )
-
-        super().apply_filters(filters)
-        super().trim_to_date_range(days_back, date_col)
-
-        group_cols = [date_col] + ([segment_col] if segment_col else [])
-
-        if aggregator == 'sum':
-            agg_dict = {col: 'sum' for col in target_cols}
-            agg_dict.update({col: 'sum' for col in all_count_cols})
-            agg_df = self.df.groupby(group_cols, as_index=False).agg(agg_dict)
-        elif aggregator == 'avg':
-            agg_dict = {col: 'mean' for col in target_cols}
-            if all_count_cols:
-                agg_dict.update({col: 'sum' for col in all_count_cols})
-            agg_df = self.df.groupby(group_cols, as_index=False).agg(agg_dict)
-        elif aggregator == 'weighted_avg':
-            cc_list = count_col if isinstance(count_col, list) else [count_col] * len(target_cols)
-            for tc, cc in zip(target_cols, cc_list):
-                denom = self.df.groupby(group_cols)[cc].transform('sum')
-                self.df[f'{tc}_w'] = self.df[tc] * self.df[cc] / denom
-            agg_dict = {f'{tc}_w': 'sum' for tc in target_cols}
-            agg_dict.update({cc: 'sum' for cc in set(all_count_cols)})
-            agg_df = self.df.groupby(group_cols, as_index=False).agg(agg_dict)
-            agg_df.rename(columns={f'{tc}_w': tc for tc in target_cols}, inplace=True)
-        self.df = agg_df
-
-        super().convert_to_date_granularity(date_col, granularity)
-
-        if incomplete_drop and granularity in ['weekly', 'monthly']:
-            super().drop_incomplete_last_period_if_requested(date_col)
+        check_top_n(top_n)
+        if top_n is not None and not segment_col:
+            raise ValueError("top_n folds segments, so it needs a segment_col.")
+
+        agg_df = self.daily_values(date_col, filters, days_back, segment_col, aggregator, target_cols,
+                                   all_count_cols, granularity, now)
+        if top_n is not None:
+            # Segments past the top_n are read again as one, so means and weighted means stay exact
+            top = self.top_segments(agg_df, segment_col, top_n, target_cols[0], aggregator,
+                                    all_count_cols[0] if all_count_cols else None)
+            if top is not None:
+                with profile_stage(self, 'top_n', agg_df) as stage:
+                    # Segments become strings, so a segment equal to other_label would join the tail
+                    check_other_label(as_str(agg_df[segment_col]), other_label)
+                    top_set = set(top)
+                    others = [s for s in agg_df[segment_col].unique() if s not in top_set]
+                    other_df = self.daily_values(date_col, {**(filters or {}), segment_col: others}, days_back, None,
+                                                 aggregator, target_cols, all_count_cols, granularity, now)
+                    agg_df = pd.concat([agg_df[agg_df[segment_col].isin(top_set)],
+                                        other_df.assign(**{segment_col: other_label})], ignore_index=True)
+                    # As strings, categorized so the kept segments sort by their own values and other_label last
+                    segments = pd.Categorical(agg_df[segment_col].astype(str), categories=folded_order(top, other_label))
+                    agg_df[segment_col] = stage.out(segments)
+
+        with profile_stage(self, 'granularity', agg_df) as stage:
+            df = self.convert_to_date_granularity(agg_df, date_col, granularity)
+
+            if incomplete_drop and granularity not in ['hourly', 'daily']:
+                df = self.drop_incomplete_last_period_if_requested(df, date_col)
+            agg_df = stage.out(df)
         
         group_cols = ['period_start','period_end'] + ([segment_col] if segment_col else [])
-        if granularity != 'daily':
-            if period_aggregator == 'sum':
-                agg_df = self.df.groupby(group_cols, as_index=False).agg(
-                    {col: 'sum' for col in target_cols}
-                )
-            elif period_aggregator == 'avg':
-                agg_dict = {col: 'mean' for col in target_cols}
-                if all_count_cols:
-                    agg_dict.update({col: 'sum' for col in all_count_cols})
-                agg_df = self.df.groupby(group_cols, as_index=False).agg(agg_dict)
-            elif period_aggregator == 'weighted_avg':
-                cc_list = count_col if isinstance(count_col, list) else [count_col] * len(target_cols)
-                for tc, cc in zip(target_cols, cc_list):
-                    denom = self.df.groupby(group_cols)[cc].transform('sum')
-                    self.df[f'{tc}_w'] = self.df[tc] * self.df[cc] / denom
-                agg_dict = {f'{tc}_w': 'sum' for tc in target_cols}
-                agg_choice = count_period_aggregator or 'mean'
-                agg_dict.update({cc: agg_choice for cc in set(all_count_cols)})
-                agg_df = self.df.groupby(group_cols, as_index=False).agg(agg_dict)
-                agg_df.rename(columns={f'{tc}_w': tc for tc in target_cols}, inplace=True)
+        with profile_stage(self, 'period_aggregate', df) as stage:
+            if granularity not in ['hourly', 'daily']:
+                if period_aggregator == 'sum':
+                    agg_df = df.groupby(group_cols, as_index=False, observed=True).agg(
+                        {col: 'sum' for col in target_cols}
+                    )
+                elif period_aggregator == 'avg':
+                    agg_dict = {col: 'mean' for col in target_cols}
+                    if all_count_cols:
+                        agg_dict.update({col: 'sum' for col in all_count_cols})
+                    agg_df = df.groupby(group_cols, as_index=False, observed=True).agg(agg_dict)
+                elif period_aggregator == 'weighted_avg':
+                    # Daily values weighted by the daily counts, plus the counts' own period aggregate
+                    # ('mean' is sum / number of days), all from one grouped reduction
+                    pairs = list(zip(target_cols, all_count_cols))
+                    counts = list(dict.fromkeys(all_count_cols))
+                    count_means = (count_period_aggregator or 'mean') == 'mean'
+                    partials = partial_aggregate(df, group_cols, sum_cols=counts,
+                                                 count_cols=counts if count_means else [], weighted=pairs)
+                    agg_df = finalize_partials(partials, group_cols,
+                                               sums=[] if count_means else counts,
+                                               means=counts if count_means else [],
+                                               weighted=pairs)
+
+            agg_df[date_col] = agg_df['period_start']
+            agg_df = stage.out(agg_df.sort_values(date_col, ignore_index=True))
+        return to_output(agg_df, output)
+
+    @profiled
+    @cached_plot
+    def plot(
+        self,
+        date_col,
+        target_col,
+        filters=None,
+        segment_col=None,
+        aggregator=None,
+        period_aggregator=None,
+        count_col=None,
+        count_period_aggregator='mean',
+        granularity='daily',
+        incomplete_drop=False,
+        days_back=30,
+        figsize=[700, 271],
+        y_range=None,
+        raw_hover=False,
+        now=None,
+        webgl=None,
+        max_points=None,
+        top_n=None,
+        other_label='Other'
+    ):
 
-        agg_df[date_col] = agg_df['period_start']
-        agg_df = agg_df.sort_values(date_col)
-        self._test = agg_df
-        
-        fig = go.Figure()
-        
+        check_max_points(max_points)
+        # We need the list of count columns for tooltip generation later
+        target_cols, all_count_cols = self.target_and_count_cols(target_col, count_col)
+        agg_df = self.aggregate(
+            date_col, target_col, filters, segment_col, aggregator, period_aggregator, count_col,
+            count_period_aggregator, granularity, incomplete_drop, days_back, now,
+            top_n=top_n, other_label=other_label
+        )
+
+        # (frame, value column, name, color, tooltip columns) for every trace
+        series = []
         if segment_col:
-            
-            sorted_segments = sorted(agg_df[segment_col].unique())
-            
-            for segment, color in zip(sorted_segments, self.colors):
-                seg_data = agg_df[agg_df[segment_col] == segment].copy()
-                
-                hover_text = self._create_trace_tooltip(
-                    trace_df=seg_data,
-                    granularity=granularity,
-                    trace_name=str(segment),
-                    value_col=target_cols[0],
-                    other_cols_to_include=all_count_cols
-                )
-                self.add_scatter_trace(fig, seg_data, date_col, target_cols[0], str(segment), color, hover_text)
+            if top_n is not None and isinstance(agg_df[segment_col].dtype, pd.CategoricalDtype):
+                # Folded segments keep aggregate()'s order, with other_label last
+                order = list(agg_df[segment_col].cat.categories)
+            else:
+                order = sorted(agg_df[segment_col].unique())
+            segments = segment_positions(agg_df, segment_col, order)
+            for i, (segment, rows) in enumerate(segments):
+                series.append((agg_df.iloc[rows], target_cols[0], str(segment), cycle_color(self.colors, i), all_count_cols))
         else:
-
             for i, tc in enumerate(sorted(target_cols)):
-                color = self.colors[i % len(self.colors)]
-                
+                color = cycle_color(self.colors, i)
+
                 current_count_col_for_tooltip = []
                 if aggregator in ['weighted_avg', 'avg']:
                     if isinstance(count_col, str):
@@ -190,45 +292,51 @@ class DateLinePlotter(DatePlotter):
                     elif isinstance(count_col, list) and len(count_col) > i:
                         # Case 2: A list of count_cols. Apply the corresponding one.
                         current_count_col_for_tooltip = [count_col[i]]
-
+                series.append((agg_df, tc, str(tc), color, current_count_col_for_tooltip))
+
+        if max_points is not None:
+            with profile_stage(self, 'downsample', sum(len(frame) for frame, *rest in series)) as stage:
+                # Only the drawn points are thinned out; the returned frame keeps every period
+                series = [
+                    (frame.iloc[lttb_indices(frame[date_col].to_numpy('datetime64[ns]'), frame[value_col].to_numpy(), max_points)],
+                     value_col, name, color, cols)
+                    for frame, value_col, name, color, cols in series
+                ]
+                stage.out(sum(len(frame) for frame, *rest in series))
+        webgl = self.use_webgl(webgl, sum(len(frame) for frame, *rest in series))
+
+        traces = []
+        with profile_stage(self, 'tooltips', sum(len(frame) for frame, *rest in series)):
+            for frame, value_col, name, color, cols in series:
                 hover_text = self._create_trace_tooltip(
-                    trace_df=agg_df,
+                    trace_df=frame,
                     granularity=granularity,
-                    trace_name=str(tc),
-                    value_col=tc,
-                    other_cols_to_include=current_count_col_for_tooltip
+                    trace_name=name,
+                    value_col=value_col,
+                    other_cols_to_include=cols,
+                    raw=raw_hover
                 )
-                self.add_scatter_trace(fig, agg_df, date_col, tc, str(tc), color, hover_text)
-                
-        fig.update_layout(
+                traces.append(self.scatter_trace(frame, date_col, value_col, name, color, hover_text, webgl))
+
+        layout = dict(
             font=dict(family="Poppins-Medium, sans-serif"),
             plot_bgcolor="white", 
             title=self.title_dict,
-            yaxis=self.axis_dict,
+            yaxis=self.axis_dict if y_range is None else {**self.axis_dict, 'range': y_range},
             margin=dict(l=self.n+10, r=0, t=self.n, b=self.n),
             legend=self.legend_dict,
             legend_title=self.convert_str_2_title(segment_col),
             hoverlabel=dict(align="left"),
             width=figsize[0],
-            height=figsize[1]
+            height=figsize[1],
+            xaxis={**self.axis_dict, "tickformat": "%b %d"}
         )
-
-        if y_range is not None:
-            fig.update_yaxes(range=y_range)
-        
-        if len(fig.data) > 0 and (agg_df.shape[0] / len(fig.data)) < 10:
-            fig.update_layout(
-                        xaxis={**self.axis_dict, 
-                               "tickformat": "%b %d",
-                               'tickvals': agg_df[date_col].unique(),
-                               'ticktext': pd.to_datetime(agg_df[date_col].unique()).strftime("%b %d")},
-                    )
-        else:
-            fig.update_layout(
-                        xaxis={**self.axis_dict, 
-                               "tickformat": "%b %d"}
-                    )
-        return fig
+        data_layout = None
+        if len(traces) > 0 and (agg_df.shape[0] / len(traces)) < 10:
+            dates = agg_df[date_col].unique()
+            data_layout = dict(xaxis={'tickvals': dates, 'ticktext': pd.to_datetime(dates).strftime("%b %d")})
+        with profile_stage(self, 'figure'):
+            return self.figures.figure(traces, layout, data_layout), agg_df
     
 class ErrorDateLinePlotter(DatePlotter):
     """
@@ -241,6 +349,30 @@ class ErrorDateLinePlotter(DatePlotter):
         The DataFrame containing the data to be plotted. This parameter is mandatory.
     title : str
         The title of the plot. This parameter is mandatory.
+    copy : bool, optional, default=True
+        If False, the DataFrame is used without copying it (plot() never modifies it). The caller must not
+        modify it while the plotter is in use.
+    date_col : str, optional, default=None
+        If given, the DataFrame is converted and sorted by this date column once, so trimming to days_back
+        is a binary search instead of a full scan. Pass the same column as plot()'s date_col.
+    engine : str, optional, default=None
+        'pandas' or 'polars'. With 'polars', filtering, trimming and the per-day aggregation run as one
+        multi-threaded polars query and only the daily result reaches pandas. None picks 'polars' for
+        polars/pyarrow inputs and 'pandas' otherwise (other inputs are then converted to pandas).
+    cache : PlotCache or DiskCache, optional, default=None
+        If given, plot() results (figure and aggregated frame) are looked up in and stored to this cache,
+        keyed by a fingerprint of the data, the title and the plot() arguments with a pinned now.
+    validate : bool, optional, default=True
+        If False, figures are assembled from plain dicts and a layout validated once per process instead of
+        going through plotly's validation on every call; the figures are identical, just built faster.
+    dimensions : list, optional, default=None
+        Segment and filter columns to store as pandas categoricals when the plotter is built, which shrinks
+        string-heavy columns and speeds up their filtering and grouping on every call.
+    downcast : bool, optional, default=False
+        If True, integer columns are narrowed to the smallest integer type that holds their values.
+    profiler : Profiler, optional, default=None
+        If given, every plot() and aggregate() call records the wall time, rows in and out and, with
+        trace_memory, the peak memory of each pipeline stage to this profiler.
     
     plot() method arguments:
     ------------------------
@@ -256,7 +388,8 @@ class ErrorDateLinePlotter(DatePlotter):
     filters : dict, optional, default=None
         A dictionary where keys are column names and values are lists of values to keep before plotting.
     granularity : str, optional, default='daily'
-        Specifies the time granularity of the plot. Possible values are 'daily', 'weekly', or 'monthly'.
+        Specifies the time granularity of the plot. Possible values are 'hourly', 'daily', 'weekly', 'monthly' or
+        'quarterly'. Weeks start on Monday; 'weekly-sun', 'weekly-sat', ... start them on another day.
     incomplete_drop : bool, optional, default=False
         If True, removes the latest time unit (e.g., the latest week if granularity='weekly') when it is incomplete. This prevents 
         outliers caused by partial data.
@@ -264,15 +397,29 @@ class ErrorDateLinePlotter(DatePlotter):
         The number of days to include in the plot, counting back from today.
     y_range : list, optional, default=[0, 100]
         Specifies the range of the y-axis.
+    raw_hover : bool, optional, default=False
+        If True, raw values are sent through customdata and formatted by plotly's hovertemplate instead of
+        pre-rendered hover strings, which shrinks the figure payload.
+    now : datetime, optional, default=None
+        The end of the days_back window. None uses the current time.
+    webgl : bool, optional, default=None
+        If True, draws the lines with WebGL (Scattergl): straight lines without markers (small markers for
+        predictions), which stays responsive with thousands of points. None does so once the chart has more
+        than WEBGL_POINTS (1,000) points; False always draws SVG.
     
     Returns:
     --------
     A line plot visualizing the difference between predicted and actual values over time.
     """
+
+    # Debugging only (last writer wins), like DateLinePlotter.result_attr
+    result_attr = '_test'
     
-    def __init__(self, df, title):
+    def __init__(self, df, title, copy=True, date_col=None, engine=None, cache=None, validate=True, dimensions=None,
+                 downcast=False, profiler=None):
 
-        super().__init__(df, title)
+        super().__init__(df, title, copy=copy, date_col=date_col, engine=engine, cache=cache, validate=validate,
+                         dimensions=dimensions, downcast=downcast, profiler=profiler)
         
         self.axis_dict = dict(
                 showline=True, 
@@ -303,107 +450,179 @@ class ErrorDateLinePlotter(DatePlotter):
     def convert_str_2_title(self, s):
         return s.replace('_',' ').title()
         
-    def compile_hover_tooltip(self, agg_df, date_col, granularity):
-        if granularity != 'daily':
-            start = pd.to_datetime(agg_df['period_start']).dt.strftime('%Y-%m-%d')
-            end = pd.to_datetime(agg_df['period_end']).dt.strftime('%Y-%m-%d')
-            agg_df['hover_text'] = start + ' → ' + end
-        else:
-            agg_df['hover_text'] = pd.to_datetime(agg_df['period_start']).dt.strftime('%Y-%m-%d')
+    def compile_hover_tooltip(self, agg_df, date_col, granularity, raw=False):
+        """
+        Adds a 'hover_text' column covering every other column of agg_df. If raw, returns the
+        (customdata, hovertemplate) pair for those columns instead and leaves agg_df unchanged.
+        """
+        fields = [(self.convert_str_2_title(c), c) for c in agg_df.columns
+                  if c not in [date_col, 'hover_text', 'period_end', 'period_start']]
+        if raw:
+            return self.build_hover_customdata(agg_df, granularity, fields, number_style='round', date_style='iso')
+        agg_df['hover_text'] = self.build_hover_text(agg_df, granularity, fields, number_style='round', date_style='iso')
+        return agg_df
 
-        for c in [x for x in agg_df.columns if x not in [date_col, 'hover_text', 'period_end', 'period_start']]:
-            c_title = self.convert_str_2_title(c)
-            val = agg_df[c].round(2).apply(lambda x: "{:,}".format(x)) if agg_df[c].dtype in ['float64', 'int64'] else agg_df[c].astype(str)
-            agg_df['hover_text'] = agg_df['hover_text'] + '<br>' + c_title + ': ' + val
+    def error_connectors_trace(self, agg_df, date_col, actual_col, pred_col, webgl=False):
+        """
+        Builds all actual-to-predicted connectors as a single dotted trace (a WebGL one if webgl).
+
+        Each period contributes a vertical segment (date, actual) -> (date, pred), and the
+        segments are separated by None so plotly breaks the line between them.
+        """
+        n = len(agg_df)
+        dates = agg_df[date_col].astype(object).to_numpy()
+
+        x = np.full(3 * n, None, dtype=object)
+        x[0::3] = dates
+        x[1::3] = dates
+
+        y = np.full(3 * n, None, dtype=object)
+        y[0::3] = agg_df[actual_col].to_numpy()
+        y[1::3] = agg_df[pred_col].to_numpy()
+
+        return dict(
+            type='scattergl' if webgl else 'scatter',
+            x=x,
+            y=y,
+            mode='lines',
+            line=dict(dash='dot', color='#4d4d4d'),
+            showlegend=False
+        )
 
-        return agg_df
-    
-    def plot(self, 
-             date_col, 
-             actual_col, 
-             pred_col,
-             count_col, 
-             filters=None,
-             granularity='daily', 
-             incomplete_drop=False,
-             days_back=30,
-             y_range=[0,1],
-             figsize=[700, 271]
-             ):
+    @profiled
+    def aggregate(self,
+                  date_col,
+                  actual_col,
+                  pred_col,
+                  count_col,
+                  filters=None,
+                  granularity='daily',
+                  incomplete_drop=False,
+                  days_back=30,
+                  now=None,
+                  output='pandas'
+                  ):
+        """
+        Runs plot()'s filtering, trimming, granularity and aggregation stages and returns the
+        count-weighted actual and predicted values per period as a tidy frame, without building
+        tooltips or a figure. output='arrow' returns a pyarrow Table instead of a DataFrame.
+        """
         
-        # Apply filters
-        self.apply_filters(filters)
-
-        self.trim_to_date_range(days_back, date_col)
+        if self.df is None:
+            # Daily weighted averages from the rollup or engine; re-weighting them by the daily counts below
+            # gives the same period averages as weighting the raw rows
+            df = self.read_daily(
+                date_col, filters, days_back, None,
+                sums=[count_col],
+                weighted=[(actual_col, count_col), (pred_col, count_col)],
+                granularity=granularity,
+                now=now
+            )
+        else:
+            # Apply filters and trim to the date range
+            df = self.select_rows(filters, days_back, date_col, now)
         
         target_cols = [actual_col,pred_col]
 
-        self.convert_to_date_granularity(date_col ,granularity)
-        
-        # Drop incomplete last period if requested
-        if incomplete_drop and granularity in ['weekly', 'monthly']:
-            self.drop_incomplete_last_period_if_requested(date_col)
+        with profile_stage(self, 'granularity', df) as stage:
+            df = self.convert_to_date_granularity(df, date_col ,granularity)
+            
+            # Drop incomplete last period if requested
+            if incomplete_drop and granularity not in ['hourly', 'daily']:
+                df = self.drop_incomplete_last_period_if_requested(df, date_col)
+            stage.out(df)
 
         group_cols = ['period_start','period_end']
 
-        # Aggregation
-        self.df['weights'] = self.df[count_col] / self.df.groupby(group_cols)[count_col].transform('sum')
-        for tc in target_cols:
-            self.df[tc + '_weighted'] = self.df[tc] * self.df['weights']
-        weighted_cols = [tc + '_weighted' for tc in target_cols] + [count_col]
-        agg_df = self.df.groupby(group_cols, as_index=False)[weighted_cols].sum()
-        for tc in target_cols:
-            agg_df[tc] = agg_df[tc + '_weighted']
-            agg_df.drop(columns=tc + '_weighted', inplace=True)
+        # Aggregation: count-weighted averages from one grouped reduction of sum(x*count) and sum(count)
+        with profile_stage(self, 'aggregate', df) as stage:
+            pairs = [(tc, count_col) for tc in target_cols]
+            partials = partial_aggregate(df, group_cols, sum_cols=[count_col], weighted=pairs)
+            agg_df = stage.out(finalize_partials(partials, group_cols, sums=[count_col], weighted=pairs))
 
-        # compile text for hover panel
-        agg_df = self.compile_hover_tooltip(agg_df, date_col, granularity)
-        
         # Convert period back to a suitable date representation for plotting
         # We'll use the start of the period for the x-axis
         agg_df[date_col] = agg_df['period_start']
-        agg_df['color'] = agg_df['sample_size'].apply(self.assign_color)
-        
-        self._test = agg_df
-        fig = go.Figure()
+        return to_output(agg_df, output)
 
-        # Add dashed lines for errors
-        for i in range(len(agg_df)):
-            fig.add_trace(go.Scatter(
-                x=[agg_df[date_col].iloc[i], agg_df[date_col].iloc[i]],  # Ensure vertical line on the same date
-                y=[agg_df[actual_col].iloc[i], agg_df[pred_col].iloc[i]],  # From actual to predicted value
-                mode='lines',
-                line=dict(dash='dot', color='#4d4d4d'),
-                showlegend=False
-            ))
+    @profiled
+    @cached_plot
+    def plot(self,
+             date_col,
+             actual_col,
+             pred_col,
+             count_col, 
+             filters=None,
+             granularity='daily', 
+             incomplete_drop=False,
+             days_back=30,
+             y_range=[0,1],
+             figsize=[700, 271],
+             raw_hover=False,
+             now=None,
+             webgl=None
+             ):
+
+        agg_df = self.aggregate(date_col, actual_col, pred_col, count_col, filters, granularity, incomplete_drop,
+                                days_back, now)
+        # Actual and predicted values are both drawn, so the chart has two points per period
+        webgl = self.use_webgl(webgl, 2 * len(agg_df))
+
+        # compile text for hover panel
+        with profile_stage(self, 'tooltips', agg_df):
+            if raw_hover:
+                customdata, hovertemplate = self.compile_hover_tooltip(agg_df, date_col, granularity, raw=True)
+                hover = dict(customdata=customdata, hovertemplate=hovertemplate)
+            else:
+                agg_df = self.compile_hover_tooltip(agg_df, date_col, granularity)
+                hover = dict(text=agg_df['hover_text'], hoverinfo='text')
             
-        # Add the actual value line and markers
-        fig.add_trace(go.Scatter(
-            x=agg_df[date_col],
-            y=agg_df[actual_col],
-            mode='lines+markers',
-            line=dict(color=self.colors[0], width=4),
-            marker=dict(size=10),  
-            line_shape='spline',
-            text=agg_df['hover_text'],
-            hoverinfo='text',
-            showlegend=False
-        ))
+            agg_df['color'] = agg_df['sample_size'].apply(self.assign_color)
         
-        # Add the predicted value markers
-        fig.add_trace(go.Scatter(
-            x=agg_df[date_col],
-            y=agg_df[pred_col],
-            mode='markers',
-            line=dict(color=self.colors[1], width=4),
-            marker=dict(size=10, color=agg_df['color'], line=dict(color='black', width=1)),
-            text=agg_df['hover_text'],
-            hoverinfo='text',
-            showlegend=False
-        ))
+        if webgl:
+            # Long histories: a straight WebGL line without markers and small unoutlined prediction markers
+            actual_style = dict(type='scattergl', mode='lines', line=dict(color=self.colors[0], width=2))
+            pred_marker = dict(size=5, color=agg_df['color'])
+        else:
+            actual_style = dict(type='scatter', mode='lines+markers',
+                                line=dict(color=self.colors[0], width=4, shape='spline'), marker=dict(size=10))
+            pred_marker = dict(size=10, color=agg_df['color'], line=dict(color='black', width=1))
+        traces = [
+            # Add dashed lines for errors
+            self.error_connectors_trace(agg_df, date_col, actual_col, pred_col, webgl),
+            # Add the actual value line and markers
+            dict(
+                x=agg_df[date_col],
+                y=agg_df[actual_col],
+                showlegend=False,
+                **actual_style,
+                **hover
+            ),
+            # Add the predicted value markers
+            dict(
+                type='scattergl' if webgl else 'scatter',
+                x=agg_df[date_col],
+                y=agg_df[pred_col],
+                mode='markers',
+                line=dict(color=self.colors[1], width=4),
+                marker=pred_marker,
+                showlegend=False,
+                **hover
+            ),
+        ]
+        # Legend entries for the sample size colors
+        for color, name in [('red', '≤ 1,000 sample size'), ('yellow', '1,001 – 10,000 sample size'),
+                            ('green', '> 10,000 sample size')]:
+            traces.append(dict(
+                type='scatter',
+                x=[None], 
+                y=[None], 
+                mode='markers',
+                marker=dict(size=10, color=color, line=dict(color='black', width=1)),
+                name=name
+            ))
                 
-        # Update layout
-        fig.update_layout(
+        layout = dict(
             barmode='stack',
             font=dict(family="Poppins-Medium, sans-serif"),
             plot_bgcolor="white", 
@@ -413,50 +632,15 @@ class ErrorDateLinePlotter(DatePlotter):
             legend = self.legend_dict,
             hoverlabel=dict(align="left"),
             width=figsize[0],
-            height=figsize[1]
-        )
-
-        fig.add_trace(
-            go.Scatter(
-                x=[None], 
-                y=[None], 
-                mode='markers',
-                marker=dict(size=10, color='red', line=dict(color='black', width=1)),
-                name='≤ 1,000 sample size'
-            )
-        )
-        fig.add_trace(
-            go.Scatter(
-                x=[None], 
-                y=[None], 
-                mode='markers',
-                marker=dict(size=10, color='yellow', line=dict(color='black', width=1)),
-                name='1,001 – 10,000 sample size'
-            )
-        )
-        fig.add_trace(
-            go.Scatter(
-                x=[None], 
-                y=[None], 
-                mode='markers',
-                marker=dict(size=10, color='green', line=dict(color='black', width=1)),
-                name='> 10,000 sample size'
-            )
+            height=figsize[1],
+            xaxis={**self.axis_dict, "tickformat": "%b %d"}  # Adds month-day formatting to the x-axis
         )
-
+        data_layout = None
         if (agg_df.shape[0]) < 10:
-            fig.update_layout(
-                        xaxis={**self.axis_dict, 
-                               "tickformat": "%b %d",  # Adds month-day formatting to the x-axis
-                               'tickvals': agg_df[date_col],  # Ensure these match the x-axis data
-                               'ticktext': agg_df[date_col].dt.strftime("%b %d")},  # Format as 'Dec-14'
-                    )
-        else:
-            fig.update_layout(
-                        xaxis={**self.axis_dict, 
-                               "tickformat": "%b %d"}  # Adds month-day formatting to the x-axis
-                    )
-        return fig
+            data_layout = dict(xaxis={'tickvals': agg_df[date_col],  # Ensure these match the x-axis data
+                                      'ticktext': agg_df[date_col].dt.strftime("%b %d")})  # Format as 'Dec-14'
+        with profile_stage(self, 'figure'):
+            return self.figures.figure(traces, layout, data_layout), agg_df
     
 class DateBarPlotter(DatePlotter):
 
@@ -469,6 +653,30 @@ class DateBarPlotter(DatePlotter):
         The DataFrame containing the data to be used for plotting.
     title : str
         The title of the plot.
+    copy : bool, optional, default=True
+        If False, the DataFrame is used without copying it (plot() never modifies it). The caller must not
+        modify it while the plotter is in use.
+    date_col : str, optional, default=None
+        If given, the DataFrame is converted and sorted by this date column once, so trimming to days_back
+        is a binary search instead of a full scan. Pass the same column as plot()'s date_col.
+    engine : str, optional, default=None
+        'pandas' or 'polars'. With 'polars', filtering, trimming and the per-day aggregation run as one
+        multi-threaded polars query and only the daily result reaches pandas. None picks 'polars' for
+        polars/pyarrow inputs and 'pandas' otherwise (other inputs are then converted to pandas).
+    cache : PlotCache or DiskCache, optional, default=None
+        If given, plot() results (figure and aggregated frame) are looked up in and stored to this cache,
+        keyed by a fingerprint of the data, the title and the plot() arguments with a pinned now.
+    validate : bool, optional, default=True
+        If False, figures are assembled from plain dicts and a layout validated once per process instead of
+        going through plotly's validation on every call; the figures are identical, just built faster.
+    dimensions : list, optional, default=None
+        Segment and filter columns to store as pandas categoricals when the plotter is built, which shrinks
+        string-heavy columns and speeds up their filtering and grouping on every call.
+    downcast : bool, optional, default=False
+        If True, integer columns are narrowed to the smallest integer type that holds their values.
+    profiler : Profiler, optional, default=None
+        If given, every plot() and aggregate() call records the wall time, rows in and out and, with
+        trace_memory, the peak memory of each pipeline stage to this profiler.
     
     plot() Method Parameters:
     --------------------------
@@ -483,11 +691,22 @@ class DateBarPlotter(DatePlotter):
     part_of_whole : bool, optional, default=False
         If True, calculates and displays the target metric as a percentage of the total for each time period.
     granularity : str, optional, default='daily'
-        The time granularity for grouping data. Options: 'daily', 'weekly', or 'monthly'.
+        The time granularity for grouping data. Options: 'hourly', 'daily', 'weekly', 'monthly' or 'quarterly'.
+        Weeks start on Monday; 'weekly-sun', 'weekly-sat', ... start them on another day.
     incomplete_drop : bool, optional, default=False
         If True, removes data from the last incomplete period (e.g., an incomplete week or month).
     days_back : int, optional, default=30
         The number of days to include in the plot, starting from today.
+    raw_hover : bool, optional, default=False
+        If True, raw values are sent through customdata and formatted by plotly's hovertemplate instead of
+        pre-rendered hover strings, which shrinks the figure payload.
+    now : datetime, optional, default=None
+        The end of the days_back window. None uses the current time.
+    top_n : int, optional, default=None
+        If given, only the top_n segments by their total target over the window get their own bars; the
+        rest are summed into a single other_label segment. Requires segment_col.
+    other_label : str, optional, default='Other'
+        The segment name of the folded segments when top_n is used; it must not be a segment of the data.
     
     Usage:
     ------
@@ -500,9 +719,14 @@ class DateBarPlotter(DatePlotter):
         A Plotly figure object representing the generated bar plot.
     """
 
-    def __init__(self, df, title):
+    # Debugging only (last writer wins), like DateLinePlotter.result_attr
+    result_attr = 'test'
 
-        super().__init__(df, title)
+    def __init__(self, df, title, copy=True, date_col=None, engine=None, cache=None, validate=True, dimensions=None,
+                 downcast=False, profiler=None):
+
+        super().__init__(df, title, copy=copy, date_col=date_col, engine=engine, cache=cache, validate=validate,
+                         dimensions=dimensions, downcast=downcast, profiler=profiler)
 
         self.axis_dict = dict(
                 showline=True, 
@@ -525,21 +749,87 @@ class DateBarPlotter(DatePlotter):
     def convert_str_2_title(self, s):
         return s.replace('_',' ').title()
     
-    def compile_hover_tooltip(self, agg_df, date_col, granularity):
-        if granularity != 'daily':
-            start = pd.to_datetime(agg_df['period_start']).dt.strftime('%Y-%m-%d')
-            end = pd.to_datetime(agg_df['period_end']).dt.strftime('%Y-%m-%d')
-            agg_df['hover_text'] = start + ' → ' + end
+    def compile_hover_tooltip(self, agg_df, date_col, granularity, raw=False):
+        """
+        Adds a 'hover_text' column covering every other column of agg_df. If raw, returns the
+        (customdata, hovertemplate) pair for those columns instead and leaves agg_df unchanged.
+        """
+        fields = [(self.convert_str_2_title(c), c) for c in agg_df.columns
+                  if c not in [date_col, 'hover_text', 'period_end', 'period_start']]
+        if raw:
+            return self.build_hover_customdata(agg_df, granularity, fields, number_style='round', date_style='iso')
+        agg_df['hover_text'] = self.build_hover_text(agg_df, granularity, fields, number_style='round', date_style='iso')
+        return agg_df
+        
+    @profiled
+    def aggregate(self,
+                  date_col,
+                  target_col,
+                  filters=None,
+                  segment_col=None,
+                  part_of_whole=False,
+                  granularity='daily',
+                  incomplete_drop=False,
+                  days_back=30,
+                  now=None,
+                  output='pandas',
+                  top_n=None,
+                  other_label='Other'):
+        """
+        Runs plot()'s filtering, trimming, granularity and aggregation stages and returns the summed
+        target (and its percentage of each period with part_of_whole) per period and segment as a
+        tidy frame, without building tooltips or a figure. output='arrow' returns a pyarrow Table.
+        """
+        check_top_n(top_n)
+        if top_n is not None and not segment_col:
+            raise ValueError("top_n folds segments, so it needs a segment_col.")
+        
+        if self.df is None:
+            df = self.read_daily(date_col, filters, days_back, segment_col, sums=[target_col],
+                                  granularity=granularity, now=now)
         else:
-            agg_df['hover_text'] = pd.to_datetime(agg_df['period_start']).dt.strftime('%Y-%m-%d')
+            # Apply filters and trim to the date range
+            df = self.select_rows(filters, days_back, date_col, now)
+
+        top = None
+        if top_n is not None:
+            # Sums add up, so the segments past the top_n are simply relabelled before grouping (as
+            # strings, categorized so the kept segments sort by their own values and other_label last)
+            with profile_stage(self, 'top_n', df) as stage:
+                top = self.top_segments(df, segment_col, top_n, target_col)
+                if top is not None:
+                    order = folded_order(top, other_label)
+                    segments = fold_keys(as_str(df[segment_col]), order[:-1], other_label)
+                    df = df.assign(**{segment_col: segments.astype(pd.CategoricalDtype(order))})
+                stage.out(df)
+        
+        with profile_stage(self, 'granularity', df) as stage:
+            df = self.convert_to_date_granularity(df, date_col ,granularity)
+            
+            # Drop incomplete last period if requested
+            if incomplete_drop and granularity not in ['hourly', 'daily']:
+                df = self.drop_incomplete_last_period_if_requested(df, date_col)
+            stage.out(df)
+            
+        group_cols = ['period_start','period_end'] + ([segment_col] if segment_col else [])
+        
+        with profile_stage(self, 'aggregate', df) as stage:
+            data_grouped = df.groupby(group_cols, observed=True)[target_col].sum().reset_index()
+            if segment_col and top is None:
+                data_grouped[segment_col] = data_grouped[segment_col].astype(str)
+            
+            if part_of_whole == True:
+                data_grouped[f'total_{target_col}'] = data_grouped.groupby('period_start')[target_col].transform('sum')
+                data_grouped[f'{target_col}_percentage'] = data_grouped[target_col] / data_grouped[f'total_{target_col}'] * 100
+            stage.out(data_grouped)
 
-        for c in [x for x in agg_df.columns if x not in [date_col, 'hover_text', 'period_end', 'period_start']]:
-            c_title = self.convert_str_2_title(c)
-            val = agg_df[c].round(2).apply(lambda x: "{:,}".format(x)) if agg_df[c].dtype in ['float64', 'int64'] else agg_df[c].astype(str)
-            agg_df['hover_text'] = agg_df['hover_text'] + '<br>' + c_title + ': ' + val
+        # Convert period back to a suitable date representation for plotting
+        # We'll use the start of the period for the x-axis
+        data_grouped[date_col] = data_grouped['period_start']
+        return to_output(data_grouped, output)
 
-        return agg_df
-        
+    @profiled
+    @cached_plot
     def plot(self, 
                  date_col, 
                  target_col, 
@@ -550,89 +840,75 @@ class DateBarPlotter(DatePlotter):
                  incomplete_drop=False,
                  days_back=30,
                  figsize=[600, 271],
-                 y_range=None):
-        
-        # Apply filters
-        self.apply_filters(filters)
-
-        self.trim_to_date_range(days_back, date_col)
-        
-        self.convert_to_date_granularity(date_col ,granularity)
-        
-        # Drop incomplete last period if requested
-        if incomplete_drop and granularity in ['weekly', 'monthly']:
-            self.drop_incomplete_last_period_if_requested(date_col)
-            
-        group_cols = ['period_start','period_end'] + ([segment_col] if segment_col else [])
-        
-        data_grouped = self.df.groupby(group_cols)[target_col].sum().reset_index()
-        if segment_col:
-            data_grouped[segment_col] = data_grouped[segment_col].astype(str)
-        
-        if part_of_whole == True:
-            data_grouped[f'total_{target_col}'] = data_grouped.groupby('period_start')[target_col].transform('sum')
-            data_grouped[f'{target_col}_percentage'] = data_grouped[target_col] / data_grouped[f'total_{target_col}'] * 100
-
-        data_grouped = self.compile_hover_tooltip(data_grouped, date_col, granularity)
-        
-        # Convert period back to a suitable date representation for plotting
-        # We'll use the start of the period for the x-axis
-        data_grouped[date_col] = data_grouped['period_start']
-        self.test = data_grouped
-        fig = go.Figure()
+                 y_range=None,
+                 raw_hover=False,
+                 now=None,
+                 top_n=None,
+                 other_label='Other'):
+
+        data_grouped = self.aggregate(date_col, target_col, filters, segment_col, part_of_whole, granularity,
+                                      incomplete_drop, days_back, now, top_n=top_n, other_label=other_label)
+
+        with profile_stage(self, 'tooltips', data_grouped):
+            if raw_hover:
+                customdata, hovertemplate = self.compile_hover_tooltip(data_grouped, date_col, granularity, raw=True)
+            else:
+                data_grouped = self.compile_hover_tooltip(data_grouped, date_col, granularity)
+        traces = []
         
         if segment_col:
-                for i, tier in enumerate(data_grouped[segment_col].unique()):
-                    tier_data = data_grouped[data_grouped[segment_col] == tier]
-                    fig.add_trace(go.Bar(
+                order = None
+                if top_n is not None and isinstance(data_grouped[segment_col].dtype, pd.CategoricalDtype):
+                    # Folded segments keep aggregate()'s order, with other_label last
+                    order = list(data_grouped[segment_col].cat.categories)
+                for i, (tier, rows) in enumerate(segment_positions(data_grouped, segment_col, order)):
+                    tier_data = data_grouped.iloc[rows]
+                    if raw_hover:
+                        hover = dict(customdata=customdata[rows], hovertemplate=hovertemplate)
+                    else:
+                        # Filtered hover text for the current tier
+                        hover = dict(text=tier_data['hover_text'], hoverinfo='text', textposition="none")
+                    traces.append(dict(
+                        type='bar',
                         x=tier_data[date_col],
                         y=tier_data[f'{target_col}_percentage'] if part_of_whole else tier_data[target_col],
                         name=tier,
-                        marker=dict(color=self.colors[i]),
-                        text=tier_data['hover_text'],  # Filtered hover text for the current tier
-                        hoverinfo='text',
-                        textposition="none"
+                        marker=dict(color=cycle_color(self.colors, i)),
+                        **hover
                     ))
         else:
-            fig.add_trace(go.Bar(
+            if raw_hover:
+                hover = dict(customdata=customdata, hovertemplate=hovertemplate)
+            else:
+                hover = dict(text=data_grouped['hover_text'], hoverinfo='text', textposition="none")
+            traces.append(dict(
+                type='bar',
                 x=data_grouped[date_col],
                 y=data_grouped[f'{target_col}_percentage'] if part_of_whole else data_grouped[target_col],
                 marker=dict(color=self.colors[0]),
-                text=data_grouped['hover_text'],
-                hoverinfo='text',
-                textposition="none"
+                **hover
             ))
 
-        fig.update_layout(
+        layout = dict(
             barmode='stack',
             font=dict(family="Poppins-Medium, sans-serif"),
             plot_bgcolor="white", 
             title=self.title_dict,
-            yaxis = self.axis_dict,
+            yaxis = self.axis_dict if y_range is None else {**self.axis_dict, 'range': y_range},
             margin = dict(l=self.n, r=self.n, t=self.n, b=self.n),
             legend = self.legend_dict,
             legend_title=segment_col,
             hoverlabel=dict(align="left"),
             width=figsize[0],
-            height=figsize[1]
+            height=figsize[1],
+            xaxis={**self.axis_dict, "tickformat": "%b %d"}  # Adds month-day formatting to the x-axis
         )
-        if y_range is not None:
-            fig.update_yaxes(range=y_range)
-        if (data_grouped.shape[0] / len(fig.data)) < 10:
-            fig.update_layout(
-                        xaxis={**self.axis_dict, 
-                               "tickformat": "%b %d",  # Adds month-day formatting to the x-axis
-                               'tickvals': data_grouped[date_col],  # Ensure these match the x-axis data
-                               'ticktext': data_grouped[date_col].dt.strftime("%b %d")},  # Format as 'Dec-14'
-                    )
-        else:
-            fig.update_layout(
-                        xaxis={**self.axis_dict, 
-                               "tickformat": "%b %d"}  # Adds month-day formatting to the x-axis
-                    )
-                
-
-        return fig
+        data_layout = None
+        if (data_grouped.shape[0] / len(traces)) < 10:
+            data_layout = dict(xaxis={'tickvals': data_grouped[date_col],  # Ensure these match the x-axis data
+                                      'ticktext': data_grouped[date_col].dt.strftime("%b %d")})  # Format as 'Dec-14'
+        with profile_stage(self, 'figure'):
+            return self.figures.figure(traces, layout, data_layout), data_grouped
     
 class LegendPlotter:
     def __init__(self, labels):
@@ -640,9 +916,8 @@ class LegendPlotter:
         self.colors = ["#ae37ff", "#ab8bff", "#bbc6e2",
                        "#8fb3e0", "#98c8d9", "#92e4c3",
                        "#91de73", "#bdf07f", "#e5f993"]
-        if len(self.labels) > len(self.colors):
-            raise ValueError(f"Too many labels: max {len(self.colors)}, got {len(self.labels)}.")
-        self.color_map = {str(lbl): self.colors[i] for i, lbl in enumerate(self.labels)}
+        # Same colors, in the same order, as the plotters' sorted segments
+        self.color_map = {str(lbl): cycle_color(self.colors, i) for i, lbl in enumerate(self.labels)}
         self.legend_dict = dict(orientation="h", x=0.5, y=1,
                                 xanchor="center", yanchor="top",
                                 font=dict(size=12), borderwidth=0)
@@ -1,11 +1,66 @@
 import pandas as pd
+import numpy as np
 from datetime import datetime, timedelta
+from .DateRollup import DateRollup
+from .FilterIndex import FilterIndex, filter_mask
+from .PolarsEngine import PolarsEngine, resolve_engine, to_pandas
+from .SqlSource import SqlSource
+from .ParquetSource import ParquetSource
+from .PlotCache import frame_fingerprint
+from .FigureBuilder import FigureBuilder
+from .TopN import top_n_keys
+from .Schema import normalize_frame
+from .Profiler import profile_stage
+
+WEEK_STARTS = {'mon': 0, 'tue': 1, 'wed': 2, 'thu': 3, 'fri': 4, 'sat': 5, 'sun': 6}
+
+PERIOD_GRANULARITIES = ['hourly', 'daily', 'weekly'] + [f'weekly-{d}' for d in WEEK_STARTS] + ['monthly', 'quarterly']
+
+# Charts with more points than this are drawn with WebGL (Scattergl) when plot() is called with webgl=None
+WEBGL_POINTS = 1000
+
+def is_numpy_integer(values):
+    # Plain numpy integers of any width; nullable Int64 columns may hold pd.NA and are excluded
+    return isinstance(values.dtype, np.dtype) and values.dtype.kind in 'iu'
 
 class DatePlotter():
 
-    def __init__(self, df, title):
+    def __init__(self, df, title, copy=True, date_col=None, engine=None, cache=None, validate=True, dimensions=None,
+                 downcast=False, profiler=None):
+
+        self.date_index = None
+        self.datetime_cache = {}
+        # Optional PlotCache (or DiskCache) shared across plotters; plot() results are then looked up before computing
+        self.cache = cache
+        # Optional Profiler recording the time, rows and memory of every pipeline stage of each call
+        self.profiler = profiler
+        self._fingerprint = None
+        self.rollup = None
+        self.engine = None
 
-        self.df = df.copy()
+        # A DateRollup, a SqlSource, a ParquetSource or a PolarsEngine stands in for the raw frame
+        # (self.df is then None): plots are built from the daily values it returns
+        if isinstance(df, DateRollup):
+            self.rollup = df
+            self.df = None
+        elif isinstance(df, (SqlSource, ParquetSource)):
+            self.engine = df
+            self.df = None
+        elif resolve_engine(df, engine) == 'polars':
+            self.engine = PolarsEngine(df)
+            self.df = None
+        else:
+            # plot() never mutates self.df, so with copy=False the caller's frame is wrapped as is
+            # (zero-copy); it must then not be modified while the plotter is in use. A frame
+            # converted from polars/pyarrow is already private and is never copied again.
+            converted = to_pandas(df)
+            self.df = df.copy() if copy and converted is df else converted
+            if dimensions or downcast:
+                # Segment and filter columns become categoricals (and integers narrow) once, here
+                self.df = normalize_frame(self.df, dimensions or (), downcast)
+            if date_col is not None:
+                self.index_by_date(date_col)
+            self.filter_index = FilterIndex(self.df)
         
         self.title_dict = dict(
                     text=title.title(),
@@ -14,6 +69,9 @@ class DatePlotter():
                 )
         
         self.n = 35
+
+        # validate=False assembles figures from a once-validated layout without per-call validation
+        self.figures = FigureBuilder(validate)
         
         self.colors = [
             "#ae37ff", "#ab8bff", "#bbc6e2",
@@ -38,48 +96,321 @@ class DatePlotter():
                 x=0.5,
                 font=dict(size=12)
             )
+
+        # (daily, period start, period end, hourly) formats for hover text
+        self.hover_date_formats = dict(
+                long=('%b %d, %Y', '%b %d', '%b %d, %Y', '%b %d, %Y %H:00'),
+                iso=('%Y-%m-%d', '%Y-%m-%d', '%Y-%m-%d', '%Y-%m-%d %H:00')
+            )
         
-    def apply_filters(self, filters):
-        df = self.df
+    @classmethod
+    def from_chunks(cls, chunks, title, date_col, dimensions=None, value_cols=None, weight_cols=None, cache=None,
+                    validate=True, profiler=None):
+        """
+        Builds the plotter from an iterable of DataFrame chunks (e.g. pd.read_csv(..., chunksize=...) or
+        parquet row groups) through a DateRollup: each chunk is reduced to daily partials and merged, so
+        peak memory depends on the chunk size, not the dataset. Filters and segments must be dimensions.
+        """
+        return cls(DateRollup(chunks, date_col, dimensions, value_cols, weight_cols), title, cache=cache,
+                   validate=validate, profiler=profiler)
+
+    @classmethod
+    def from_parquet(cls, path, title, partitioning='hive', date_partition=None, cache=None, validate=True,
+                     profiler=None):
+        """
+        Builds the plotter on a ParquetSource: each plot() call reads only the columns it needs and pushes
+        days_back and the filters down to partition pruning and row-group statistics.
+        """
+        return cls(ParquetSource(path, partitioning=partitioning, date_partition=date_partition), title, cache=cache,
+                   validate=validate, profiler=profiler)
+
+    def append(self, new_rows):
+        """
+        Adds raw rows to the data the next plot() call reads, on a rollup-backed plotter (a DateRollup
+        or from_chunks). Only the days touched by new_rows are re-aggregated, so a refresh loop costs
+        time proportional to the delta rather than the history.
+
+        Other plotters aggregate their raw rows on every call, so appending to them could not be
+        incremental and raises a ValueError: build a new plotter on the extended data instead (or
+        use a DateRollup for refresh loops). SQL and Parquet sources always read current data.
+        """
+        if self.rollup is not None:
+            self.rollup.append(new_rows)
+        elif isinstance(self.engine, (SqlSource, ParquetSource)):
+            raise ValueError("SqlSource and ParquetSource read the current data on every plot(); append to the table instead.")
+        else:
+            raise ValueError("append() needs a rollup-backed plotter (a DateRollup or from_chunks); "
+                             "build a new plotter on the extended data instead.")
+
+    def data_fingerprint(self):
+        """A cheap fingerprint of the plotter's data for the plot() cache, or None if it has none."""
+        if self.df is None:
+            return (self.rollup or self.engine).fingerprint()
+        if self._fingerprint is None:
+            self._fingerprint = frame_fingerprint(self.df)
+        return self._fingerprint
+
+    def read_daily(self, date_col, filters, days_back, segment_col, sums=(), means=(), weighted=(), granularity='daily',
+                   now=None):
+        """Returns the final daily (or hourly) values for one plot() call, read from the rollup, source or engine."""
+        by = [segment_col] if segment_col else []
+        if self.engine is not None:
+            with profile_stage(self, 'read') as stage:
+                return stage.out(self.engine.daily(date_col, filters, days_back, by, sums=sums, means=means,
+                                                   weighted=weighted, every='1h' if granularity == 'hourly' else '1d',
+                                                   now=now))
+        if date_col != self.rollup.date_col:
+            raise ValueError(f"date_col must be '{self.rollup.date_col}', the date column of the rollup.")
+        if granularity == 'hourly':
+            raise ValueError("A DateRollup holds daily aggregates and cannot be plotted hourly.")
+        with profile_stage(self, 'read') as stage:
+            return stage.out(self.rollup.daily(filters, days_back, by, sums=sums, means=means, weighted=weighted,
+                                               now=now))
+
+    # The pipeline helpers below never modify self.df or their input frame: each takes the
+    # current per-call frame and returns a new one, so a single instance can serve many plot()
+    # calls (and threads) over the same data.
+
+    def index_by_date(self, date_col):
+        """
+        Converts date_col to datetime64 and sorts self.df by it, once. Date trimming on date_col then
+        becomes a binary search plus a slice instead of two full-length comparisons. Both steps are
+        skipped when the frame is already typed and sorted, so zero-copy frames stay uncopied.
+        """
+        if not pd.api.types.is_datetime64_any_dtype(self.df[date_col]):
+            self.df = self.df.assign(**{date_col: pd.to_datetime(self.df[date_col])})
+        if not self.df[date_col].is_monotonic_increasing:
+            self.df = self.df.sort_values(date_col, kind='stable')
+        self.date_index = date_col
+        self.datetime_cache = {date_col: self.df[date_col]}
+
+    def cached_datetimes(self, date_col):
+        """self.df[date_col] as datetime64, converted on first use only."""
+        if date_col not in self.datetime_cache:
+            dates = self.df[date_col]
+            if not pd.api.types.is_datetime64_any_dtype(dates):
+                dates = pd.to_datetime(dates)
+            self.datetime_cache[date_col] = dates
+        return self.datetime_cache[date_col]
+
+    def date_window(self, days_back, date_col, now=None):
+        """The rows of self.df within days_back of now: a slice if self.df is indexed by date_col, else a mask."""
+        end_date = now or datetime.now()
+        start_date = end_date - timedelta(days=days_back)
+        if date_col == self.date_index:
+            values = self.df[date_col].to_numpy()
+            # Bounds in the column's own unit: round the start up and the end down, so a coarser
+            # unit never admits rows that the exact comparisons would reject
+            unit = f'M8[{np.datetime_data(values.dtype)[0]}]'
+            start, end = np.datetime64(start_date, 'us'), np.datetime64(end_date, 'us')
+            lo = start.astype(unit)
+            if lo < start:
+                lo += np.timedelta64(1, np.datetime_data(values.dtype)[0])
+            return slice(np.searchsorted(values, lo, side='left'),
+                         np.searchsorted(values, end.astype(unit), side='right'))
+        dates = self.cached_datetimes(date_col)
+        return ((dates >= start_date) & (dates <= end_date)).to_numpy()
+
+    def select_rows(self, filters, days_back, date_col, now=None):
+        """
+        Trims self.df to the date window and applies filters in one step, materializing a single frame.
+        With a date index the filters only scan the rows inside the window.
+        """
+        with profile_stage(self, 'trim', self.df) as stage:
+            rows = stage.out(self.date_window(days_back, date_col, now))
+        with profile_stage(self, 'filter', rows) as stage:
+            if isinstance(rows, slice):
+                df = self.df.iloc[rows]
+                if filters:
+                    df = df[filter_mask(df, filters, self.filter_index, rows)]
+                return stage.out(df)
+
+            if filters:
+                rows = rows & filter_mask(self.df, filters, self.filter_index)
+            df = self.df[rows]
+            if not pd.api.types.is_datetime64_any_dtype(df[date_col]):
+                df = df.assign(**{date_col: self.cached_datetimes(date_col).to_numpy()[rows]})
+            return stage.out(df)
+
+    def apply_filters(self, df, filters):
+        # One combined mask, materialized once; the cached codes only apply to self.df itself
         if filters:
-            for col, values in filters.items():
-                df = df[df[col].isin(values)]
-        self.df = df
+            index = self.filter_index if df is self.df else None
+            df = df[filter_mask(df, filters, index)]
+        return df
+
+    def trim_to_date_range(self, df, days_back, date_col, now=None):
+        dates = self.cached_datetimes(date_col) if df is self.df else pd.to_datetime(df[date_col])
+        end_date = now or datetime.now()
+        start_date = end_date - timedelta(days=days_back)
+        mask = (dates >= start_date) & (dates <= end_date)
+        return df[mask].assign(**{date_col: dates[mask]})
 
-    def trim_to_date_range(self, days_back, date_col):
-        self.df[date_col] = pd.to_datetime(self.df[date_col])
-        start_date = datetime.now() - timedelta(days=days_back)
-        end_date = datetime.now()
-        self.df = self.df[(self.df[date_col] >= start_date) & (self.df[date_col] <= end_date)]
+    def convert_to_date_granularity(self, df, date_col, granularity):
+        period_start, period_end = self.period_bounds(df[date_col], granularity)
+        return df.assign(period_start=period_start, period_end=period_end)
 
-    def convert_to_date_granularity(self, date_col, granularity):
+    def period_bounds(self, dates, granularity):
+        """
+        Returns (period_start, period_end) datetime64 arrays for a datetime Series.
+
+        Bounds are computed once per calendar day with datetime64 arithmetic, over a lookup table
+        spanning the days present, and every row is then mapped through the table by its day
+        offset. 'weekly' weeks start on Monday; 'weekly-sun' ... 'weekly-sat' pick another start.
+        Hourly and daily periods are points, so their start and end are the same.
+        """
+        if getattr(dates.dt, 'tz', None) is not None:
+            dates = dates.dt.tz_localize(None)
+        values = dates.to_numpy()
+        unit = values.dtype
+
+        if granularity == 'hourly':
+            start = values.astype('M8[h]').astype(unit)
+            return start, start
+        if granularity not in PERIOD_GRANULARITIES:
+            raise ValueError(f"granularity must be one of {', '.join(map(repr, PERIOD_GRANULARITIES))}.")
+
+        days = values.astype('M8[D]')
+        valid = ~np.isnat(days)
+        if not valid.any():
+            return days.astype(unit), days.astype(unit)
+        first, last = days[valid].min(), days[valid].max()
+
+        # The table is indexed by day offset; a very sparse span falls back to computing per row
+        if (last - first).astype('int64') < max(len(days), 366):
+            calendar = np.arange(first, last + np.timedelta64(1, 'D'))
+            cal_start, cal_end = self._calendar_bounds(calendar, granularity)
+            offsets = np.where(valid, (days - first).astype('int64'), 0)
+            start, end = cal_start[offsets], cal_end[offsets]
+            start[~valid] = end[~valid] = np.datetime64('NaT')
+        else:
+            start, end = self._calendar_bounds(days, granularity)
+        return start.astype(unit), end.astype(unit)
+
+    def _calendar_bounds(self, days, granularity):
+        # days is a datetime64[D] array; NaT stays NaT through the arithmetic
         if granularity == 'daily':
-            self.df['period_start'] = self.df[date_col].dt.floor('D')
-            self.df['period_end'] = self.df['period_start']
-        elif granularity == 'weekly':
-            self.df['period_start'] = self.df[date_col].dt.to_period('W').dt.start_time.dt.floor('D')
-            self.df['period_end'] = self.df[date_col].dt.to_period('W').dt.end_time.dt.floor('D')
-        elif granularity == 'monthly':
-            self.df['period_start'] = self.df[date_col].dt.to_period('M').dt.start_time.dt.floor('D')
-            self.df['period_end'] = self.df[date_col].dt.to_period('M').dt.end_time.dt.floor('D')
+            return days, days.copy()
+        if granularity.startswith('weekly'):
+            # 1970-01-01 (day 0) was a Thursday, weekday 3 with Monday as 0
+            first_weekday = WEEK_STARTS[granularity.partition('-')[2] or 'mon']
+            back = (days.astype('int64') + 3 - first_weekday) % 7
+            start = days - back.astype('m8[D]')
+            return start, start + np.timedelta64(6, 'D')
+        months = days.astype('M8[M]')
+        if granularity == 'quarterly':
+            # Month 0 is January 1970, so quarters start at multiples of three
+            months = months - (months.astype('int64') % 3).astype('m8[M]')
+            step = np.timedelta64(3, 'M')
         else:
-            raise ValueError("granularity must be one of 'daily', 'weekly', or 'monthly'.")
+            step = np.timedelta64(1, 'M')
+        return months.astype('M8[D]'), (months + step).astype('M8[D]') - np.timedelta64(1, 'D')
 
-    def drop_incomplete_last_period_if_requested(self, date_col):
-        
-        self.df['period_end'] = pd.to_datetime(self.df['period_end']).dt.date
-        self.df[date_col] = pd.to_datetime(self.df[date_col]).dt.date
-        
-        self.df['period_end'] = pd.to_datetime(self.df['period_end']).dt.date
-        self.df[date_col] = pd.to_datetime(self.df[date_col]).dt.date
-        
-        max_period = self.df['period_end'].max()
-        max_date = self.df[date_col].max()
+    def drop_incomplete_last_period_if_requested(self, df, date_col):
+        # The last period is incomplete when the data stops before the period's last day
+        max_period = df['period_end'].max()
+        max_date = df[date_col].max().floor('D')
         if max_date < max_period:
-            self.df = self.df[self.df['period_end'] != max_period]
+            df = df[df['period_end'] != max_period]
+        return df
     
+    def top_segments(self, daily, segment_col, top_n, value_col, how='sum', weight_col=None):
+        """
+        The top_n segments of daily (values per day and segment) ranked by value_col over the whole
+        window: its sum, its mean with how='avg' or its weight_col weighted mean with how='weighted_avg'.
+        None if there are no more than top_n segments.
+        """
+        grouped = daily.groupby(segment_col, observed=True)
+        if how == 'avg':
+            rank = grouped[value_col].mean()
+        elif how == 'weighted_avg':
+            rank = (daily[value_col] * daily[weight_col]).groupby(daily[segment_col], observed=True).sum() / grouped[weight_col].sum()
+        else:
+            rank = grouped[value_col].sum()
+        return top_n_keys(rank.index, rank.to_numpy(), top_n)
+
+    def use_webgl(self, webgl, n_points):
+        """Whether line traces are drawn with WebGL: webgl itself if given, else whether n_points exceeds WEBGL_POINTS."""
+        if webgl is None:
+            return n_points > WEBGL_POINTS
+        return bool(webgl)
+
     # This helper function is now in DateLinePlotter, as it's used there.
     def convert_str_2_title(self, s):
         if s is None:
             return ""
-        return s.replace('_',' ').title()
\ No newline at end of file
+        return s.replace('_',' ').title()
+
+    # Hover text engine shared by all date plotters. Periods are formatted once per distinct
+    # value and every column is formatted in a single pass, then the pieces are joined with
+    # vectorized object-array concatenation.
+
+    def period_labels(self, df, granularity, date_style='long'):
+        """Returns an object array with the formatted period of every row of df."""
+        daily_fmt, start_fmt, end_fmt, hourly_fmt = self.hover_date_formats[date_style]
+
+        start_codes, starts = pd.factorize(df['period_start'])
+        starts = pd.to_datetime(starts)
+        if granularity in ('daily', 'hourly'):
+            point_fmt = daily_fmt if granularity == 'daily' else hourly_fmt
+            return np.asarray(starts.strftime(point_fmt), dtype=object)[start_codes]
+
+        end_codes, ends = pd.factorize(df['period_end'])
+        ends = pd.to_datetime(ends)
+        start_labels = np.asarray(starts.strftime(start_fmt), dtype=object)[start_codes]
+        end_labels = np.asarray(ends.strftime(end_fmt), dtype=object)[end_codes]
+        return start_labels + ' → ' + end_labels
+
+    def format_hover_values(self, values, number_style='fixed'):
+        """
+        Formats a column for hover text, returning an object array of strings.
+
+        'fixed' renders floats with two decimals and integers as is, 'round' rounds float64 columns to
+        two decimals and keeps their shortest representation, and numpy integer columns of any width (e.g.
+        downcast counts) as is. Both add thousands separators; any other dtype is converted with str.
+        """
+        if number_style == 'fixed':
+            if pd.api.types.is_float_dtype(values):
+                return np.array([f'{x:,.2f}' for x in values.round(2).tolist()], dtype=object)
+            if pd.api.types.is_integer_dtype(values):
+                return np.array([f'{x:,}' for x in values.tolist()], dtype=object)
+        elif values.dtype == 'float64' or is_numpy_integer(values):
+            return np.array([f'{x:,}' for x in values.round(2).tolist()], dtype=object)
+        return values.astype(str).to_numpy(dtype=object)
+
+    def hover_value_format(self, values, number_style='fixed'):
+        """The d3 format matching format_hover_values, for use in a hovertemplate."""
+        if number_style == 'fixed':
+            if pd.api.types.is_float_dtype(values):
+                return ':,.2f'
+            if pd.api.types.is_integer_dtype(values):
+                return ':,'
+        elif values.dtype == 'float64':
+            return ':,.2~f'
+        elif is_numpy_integer(values):
+            return ':,'
+        return ''
+
+    def build_hover_text(self, df, granularity, fields, number_style='fixed', date_style='long'):
+        """
+        Builds pre-rendered hover text for every row of df.
+
+        fields is a list of (label, column) pairs shown below the period, one per line.
+        """
+        text = self.period_labels(df, granularity, date_style)
+        for label, col in fields:
+            text = text + f'<br>{label}: ' + self.format_hover_values(df[col], number_style)
+        return pd.Series(text, index=df.index)
+
+    def build_hover_customdata(self, df, granularity, fields, number_style='fixed', date_style='long'):
+        """
+        Raw-value alternative to build_hover_text. Returns (customdata, hovertemplate): the period label
+        and the unformatted field values go to the browser, where plotly formats them, so no per-value
+        strings are built and the figure payload is smaller.
+        """
+        columns = [self.period_labels(df, granularity, date_style)]
+        template = '%{customdata[0]}'
+        for i, (label, col) in enumerate(fields, start=1):
+            columns.append(df[col].to_numpy(dtype=object))
+            template += f'<br>{label}: %{{customdata[{i}]{self.hover_value_format(df[col], number_style)}}}'
+        return np.column_stack(columns), template + '<extra></extra>'
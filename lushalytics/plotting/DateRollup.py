@@ -0,0 +1,186 @@
+import pandas as pd
+from .PlotCache import frame_fingerprint
+from datetime import datetime, timedelta
+from .FilterIndex import filter_mask
+from .Schema import widen, unify_categories
+
+
+def sum_name(col):
+    return f'{col}__sum'
+
+def count_name(col):
+    return f'{col}__count'
+
+def wsum_name(col, weight):
+    return f'{col}__x__{weight}'
+
+
+def partial_aggregate(df, keys, sum_cols=(), count_cols=(), weighted=(), dropna=True):
+    """
+    Groups df by keys into additive partial aggregates.
+
+    keys may be column names or Series aligned with df. The result holds, per group, the sum of
+    every column in sum_cols, the non-null count of every column in count_cols and, for every
+    (value, weight) pair in weighted, the weighted sum value*weight plus the weight sum. Partials
+    of disjoint row sets can be merged by summing them (see merge_partials).
+    """
+    data = {}
+    for c in sum_cols:
+        data[sum_name(c)] = df[c]
+    for c in count_cols:
+        data[count_name(c)] = df[c].notna().astype('int64')
+    for v, w in weighted:
+        data[wsum_name(v, w)] = widen(df[v]) * widen(df[w])
+        data[sum_name(w)] = df[w]
+
+    key_series = [df[k] if isinstance(k, str) else k for k in keys]
+    parts = pd.DataFrame(data, index=df.index)
+    return parts.groupby(key_series, sort=True, dropna=dropna, observed=True).sum().reset_index()
+
+def merge_partials(frames, keys, dropna=True):
+    """Merges partial aggregate frames sharing the same keys by summing their partials."""
+    stacked = pd.concat(unify_categories([f for f in frames if f is not None], keys), ignore_index=True)
+    return stacked.groupby(keys, sort=True, dropna=dropna, observed=True).sum().reset_index()
+
+def aggregate_chunks(chunks, key_fn, key_names, sum_cols=(), count_cols=(), weighted=()):
+    """
+    Partial aggregates (with missing keys kept) of a DataFrame or an iterable of DataFrame chunks.
+
+    key_fn(chunk) returns the keys of one chunk, named key_names. Chunks are reduced one at a time
+    and merged into the running partials, so memory is bounded by the chunk size plus the result.
+    """
+    chunks = [chunks] if isinstance(chunks, pd.DataFrame) else chunks
+    partials = None
+    for chunk in chunks:
+        part = partial_aggregate(chunk, key_fn(chunk), sum_cols, count_cols, weighted, dropna=False)
+        partials = part if partials is None else merge_partials([partials, part], key_names, dropna=False)
+    if partials is None:
+        raise ValueError("At least one chunk of data is required.")
+    return partials
+
+def finalize_partials(partials, keys, sums=(), means=(), weighted=()):
+    """
+    Turns partial aggregates into final values.
+
+    sums are reported as their sum, means as sum / count and every (value, weight) pair in
+    weighted as sum(value*weight) / sum(weight) under the value column's name.
+    """
+    out = partials[list(keys)].copy()
+    for c in sums:
+        out[c] = partials[sum_name(c)]
+    for c in means:
+        out[c] = partials[sum_name(c)] / partials[count_name(c)]
+    for v, w in weighted:
+        out[v] = partials[wsum_name(v, w)] / partials[sum_name(w)]
+    return out
+
+
+class DateRollup:
+    """
+    A reusable cube of additive daily partial aggregates, built once from a raw DataFrame.
+
+    The rollup is keyed by day plus the declared dimension columns and holds, for every value
+    column, its sum and non-null count and, for every value/weight pair, the weighted sum and the
+    weight. Filters and segments may only use dimension columns. Any DatePlotter subclass accepts a
+    DateRollup in place of a DataFrame; weekly and monthly views are derived by merging the daily
+    partials, so repeated plot() calls never rescan the raw rows.
+
+    Parameters:
+    -----------
+    df : pandas.DataFrame or iterable of pandas.DataFrame
+        The raw data, or chunks of it (e.g. pd.read_csv(..., chunksize=...)) that are aggregated one
+        at a time and never held in memory together.
+    date_col : str
+        The date column. Rows are bucketed by calendar day.
+    dimensions : list, optional, default=None
+        Columns that can later be used for filters and segment_col.
+    value_cols : list, optional, default=None
+        Columns that can later be used as targets or counts.
+    weight_cols : list, optional, default=None
+        Columns that can weight the value columns (e.g. count_col for 'weighted_avg').
+    """
+
+    def __init__(self, df, date_col, dimensions=None, value_cols=None, weight_cols=None):
+
+        self.date_col = date_col
+        self.dimensions = list(dimensions or [])
+        self.weight_cols = list(weight_cols or [])
+        self.value_cols = list(dict.fromkeys(list(value_cols or []) + self.weight_cols))
+        self.weighted = [(v, w) for w in self.weight_cols for v in self.value_cols if v != w]
+
+        self.partials = self._aggregate(df)
+        self._fingerprint = None
+
+    def _aggregate(self, df):
+        return aggregate_chunks(
+            df,
+            lambda chunk: [pd.to_datetime(chunk[self.date_col]).dt.floor('D').rename(self.date_col)] + self.dimensions,
+            [self.date_col] + self.dimensions,
+            sum_cols=self.value_cols,
+            count_cols=self.value_cols,
+            weighted=self.weighted
+        )
+
+    def append(self, new_rows):
+        """
+        Adds raw rows (a DataFrame or chunks) to the rollup. Only the days present in new_rows are
+        re-merged, so the cost follows the size of the delta, not the history; periods built from
+        those days, including a partial last week or month, pick up the change on the next plot().
+        """
+        new = self._aggregate(new_rows)
+        touched = self.partials[self.date_col].isin(new[self.date_col].unique())
+        merged = merge_partials([self.partials[touched], new], [self.date_col] + self.dimensions, dropna=False)
+        # Normalized (categorical) dimensions stay categorical, whatever the dtypes of new_rows
+        self.partials = pd.concat(unify_categories([self.partials[~touched], merged], self.dimensions),
+                                  ignore_index=True)
+        self._fingerprint = None
+
+    def fingerprint(self):
+        """A fingerprint of the whole rollup, for the plot() cache."""
+        if self._fingerprint is None:
+            self._fingerprint = frame_fingerprint(self.partials, sample_rows=len(self.partials))
+        return self._fingerprint
+
+    def _check_columns(self, dims=(), values=(), weighted=()):
+        for col in dims:
+            if col not in self.dimensions:
+                raise ValueError(f"Column '{col}' is not a dimension of this rollup.")
+        for col in values:
+            if col not in self.value_cols:
+                raise ValueError(f"Column '{col}' is not a value column of this rollup.")
+        for pair in weighted:
+            if tuple(pair) not in self.weighted:
+                raise ValueError(f"Column '{pair[0]}' is not weighted by '{pair[1]}' in this rollup.")
+
+    def select(self, filters=None, days_back=None, by=None, now=None):
+        """
+        Returns the daily partials left after filtering and trimming (to days_back before now, by default
+        the current time), merged by day and the by columns.
+
+        A day is kept when its start lies in the window, which trims day-stamped data exactly as the raw
+        rows would be. With intraday timestamps and a mid-day now, the day holding the start of the window
+        is left out (the raw rows keep its hours after the start) and the day of now is kept in full.
+        """
+        by = list(by or [])
+        self._check_columns(dims=list(filters or {}) + by)
+
+        p = self.partials
+        if filters:
+            p = p[filter_mask(p, filters)]
+        if days_back is not None:
+            end_date = now or datetime.now()
+            start_date = end_date - timedelta(days=days_back)
+            p = p[(p[self.date_col] >= start_date) & (p[self.date_col] <= end_date)]
+
+        return merge_partials([p.drop(columns=[d for d in self.dimensions if d not in by])],
+                              [self.date_col] + by)
+
+    def daily(self, filters=None, days_back=None, by=None, sums=(), means=(), weighted=(), now=None):
+        """
+        Returns final daily values (see finalize_partials) for the filtered, trimmed rollup,
+        one row per day and by-group.
+        """
+        self._check_columns(values=list(sums) + list(means), weighted=weighted)
+        by = list(by or [])
+        partials = self.select(filters, days_back, by, now)
+        return finalize_partials(partials, [self.date_col] + by, sums, means, weighted)
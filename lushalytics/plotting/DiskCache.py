@@ -0,0 +1,181 @@
+import base64
+import hashlib
+import json
+import os
+import tempfile
+import time
+from datetime import timedelta
+import numpy as np
+import plotly.graph_objects as go
+from .PlotCache import PlotCache
+
+
+def _import_arrow():
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise ImportError("DiskCache requires the pyarrow package (pip install pyarrow).") from e
+    return pa
+
+def decode_arrays(value):
+    """Turns the base64 typed arrays ({'dtype', 'bdata', 'shape'}) of a plotly JSON dict back into numpy arrays."""
+    if isinstance(value, dict):
+        if 'bdata' in value and 'dtype' in value:
+            array = np.frombuffer(base64.b64decode(value['bdata']), dtype=value['dtype'])
+            if 'shape' in value:
+                array = array.reshape([int(n) for n in str(value['shape']).split(',')])
+            return array
+        return {k: decode_arrays(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [decode_arrays(v) for v in value]
+    return value
+
+
+class DiskCache(PlotCache):
+    """
+    A PlotCache kept on disk, shared by every worker process on the host and surviving restarts.
+
+    Each entry is one uncompressed Arrow IPC (Feather v2) file holding the aggregated frame, with
+    the figure's JSON and the full key in its schema metadata; hits read it back through a memory
+    map. Files are written to a temporary name and renamed into place, so concurrent readers only
+    ever see complete entries and concurrent writers of the same key simply overwrite each other.
+    Entries written more than ttl ago are ignored and removed; once the directory holds more than
+    max_bytes, the oldest files are deleted first.
+
+    Parameters:
+    -----------
+    directory : str
+        Where the entries are stored; created if missing. Point every worker at the same directory.
+    ttl : timedelta, optional, default=timedelta(hours=1)
+        How long an entry stays valid after it was written. None keeps entries until evicted by size.
+    max_bytes : int, optional, default=1024**3
+        The most bytes of entries kept in the directory. None disables size-based eviction.
+    now_resolution : timedelta, optional, default=timedelta(minutes=1)
+        How far 'now' is rounded down when plot() is called without an explicit now.
+    """
+
+    SUFFIX = '.arrow'
+
+    def __init__(self, directory, ttl=timedelta(hours=1), max_bytes=1024 ** 3, now_resolution=timedelta(minutes=1)):
+        _import_arrow()
+        super().__init__(max_entries=None, max_bytes=max_bytes, now_resolution=now_resolution)
+        self.directory = os.fspath(directory)
+        self.ttl = ttl
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key):
+        digest = hashlib.blake2b(repr(key).encode(), digest_size=20).hexdigest()
+        return os.path.join(self.directory, digest + self.SUFFIX)
+
+    def _expired(self, mtime):
+        return self.ttl is not None and time.time() - mtime > self.ttl.total_seconds()
+
+    def _read(self, path, key):
+        pa = _import_arrow()
+        with pa.memory_map(path, 'r') as source:
+            table = pa.ipc.open_file(source).read_all()
+        meta = table.schema.metadata or {}
+        if meta.get(b'lushalytics.key', b'').decode() != repr(key):
+            return None
+        fig = go.Figure(decode_arrays(json.loads(meta[b'lushalytics.figure'])))
+        frame = table.to_pandas() if meta.get(b'lushalytics.frame') == b'1' else None
+        return fig, frame
+
+    def get(self, key):
+        """Returns the cached (figure, frame) for key, or None."""
+        path = self._path(key)
+        value, expired = None, False
+        try:
+            if self._expired(os.stat(path).st_mtime):
+                expired = self._remove(path)
+            else:
+                value = self._read(path, key)
+        except (OSError, ValueError, KeyError):
+            # Missing, evicted or replaced by another process while being read
+            pass
+        with self.lock:
+            self.evictions += expired
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """Writes value, a (figure, frame) pair, under key, then evicts expired and the oldest files."""
+        pa = _import_arrow()
+        fig, frame = value
+        try:
+            table = pa.table({}) if frame is None else pa.Table.from_pandas(frame)
+        except (pa.ArrowException, TypeError, ValueError):
+            # Frames holding values Arrow cannot store (e.g. mixed-type objects) are not cached
+            return
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}),
+            b'lushalytics.key': repr(key).encode(),
+            b'lushalytics.figure': fig.to_json().encode(),
+            b'lushalytics.frame': b'0' if frame is None else b'1',
+        })
+
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            self._remove(tmp)
+            raise
+        self._evict()
+
+    def _remove(self, path):
+        # Another process may have removed the file first
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+    def _entries(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(self.SUFFIX):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def _evict(self):
+        entries = sorted(self._entries())
+        live = []
+        evicted = 0
+        for mtime, size, path in entries:
+            if self._expired(mtime):
+                evicted += self._remove(path)
+            else:
+                live.append((size, path))
+        total = sum(size for size, path in live)
+        # Oldest first, always keeping the newest entry
+        for size, path in live[:-1]:
+            if self.max_bytes is None or total <= self.max_bytes:
+                break
+            evicted += self._remove(path)
+            total -= size
+        with self.lock:
+            self.evictions += evicted
+            self.nbytes = total
+
+    def clear(self):
+        """Deletes every entry in the directory; the counters are kept."""
+        for mtime, size, path in self._entries():
+            self._remove(path)
+        with self.lock:
+            self.nbytes = 0
+
+    def stats(self):
+        """This process's hit, miss and eviction counters plus the directory's current entries and bytes."""
+        entries = self._entries()
+        with self.lock:
+            return dict(hits=self.hits, misses=self.misses, evictions=self.evictions,
+                        entries=len(entries), nbytes=sum(size for mtime, size, path in entries))
@@ -0,0 +1,49 @@
+import numpy as np
+
+
+def _as_float(values):
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64) or np.issubdtype(values.dtype, np.timedelta64):
+        return values.view('int64').astype('float64')
+    return values.astype('float64')
+
+def check_max_points(max_points):
+    if max_points is not None and (isinstance(max_points, bool) or not isinstance(max_points, (int, np.integer))
+                                   or max_points < 3):
+        raise ValueError("max_points must be an integer of at least 3 or None.")
+
+def lttb_indices(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets: the positions of n_out points of the series (x, y), x sorted,
+    that best keep its visual shape. The first and last points are always kept; each of the n_out - 2
+    buckets in between keeps the point forming the largest triangle with the point kept before it
+    and the average of the next bucket. Returns every position when the series has n_out points or
+    fewer, or n_out is None; an n_out below 3 raises a ValueError. NaN values are never preferred
+    over real ones.
+    """
+    check_max_points(n_out)
+    n = len(x)
+    if n_out is None or n <= n_out:
+        return np.arange(n)
+    x = _as_float(x)
+    y = _as_float(y)
+
+    # n_out - 2 buckets over positions 1 .. n-2, as [edges[i], edges[i+1])
+    edges = np.linspace(1, n - 1, n_out - 1).astype('int64')
+    counts = np.diff(edges)
+    mean_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / counts
+    mean_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1) / counts
+    # The bucket after the last one is the last point
+    next_x = np.append(mean_x[1:], x[-1])
+    next_y = np.append(mean_y[1:], y[-1])
+
+    out = np.empty(n_out, dtype='int64')
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        area = np.abs((x[a] - next_x[i]) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (next_y[i] - y[a]))
+        area[np.isnan(area)] = -1
+        a = lo + int(np.argmax(area))
+        out[i + 1] = a
+    return out
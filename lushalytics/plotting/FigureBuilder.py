@@ -0,0 +1,81 @@
+import threading
+from collections import OrderedDict
+import pandas as pd
+import plotly.graph_objects as go
+
+# Compiled layouts shared by every plotter in the process, least recently used first
+COMPILED_LAYOUTS = OrderedDict()
+MAX_COMPILED_LAYOUTS = 512
+_compiled_lock = threading.Lock()
+
+
+def plain(value):
+    """Replaces the pandas Series/Index inside nested trace or layout dicts with numpy arrays, as validation would."""
+    if isinstance(value, dict):
+        return {k: plain(v) for k, v in value.items()}
+    if isinstance(value, (pd.Series, pd.Index)):
+        return value.to_numpy()
+    return value
+
+def merge_layout(base, extra):
+    """Returns base updated with extra, merging nested dicts key by key like fig.update_layout."""
+    out = dict(base)
+    for k, v in extra.items():
+        out[k] = merge_layout(out[k], v) if isinstance(v, dict) and isinstance(out.get(k), dict) else v
+    return out
+
+def compile_layout(layout):
+    """
+    The plotly JSON of update_layout(**layout) on an empty figure, without the template. Computed once
+    per distinct layout (by repr) and shared across plotters, so callers must not change it in place.
+    """
+    key = repr(layout)
+    with _compiled_lock:
+        if key in COMPILED_LAYOUTS:
+            COMPILED_LAYOUTS.move_to_end(key)
+            return COMPILED_LAYOUTS[key]
+    compiled = go.Figure().update_layout(**layout).layout.to_plotly_json()
+    compiled.pop('template', None)
+    with _compiled_lock:
+        COMPILED_LAYOUTS[key] = compiled
+        while len(COMPILED_LAYOUTS) > MAX_COMPILED_LAYOUTS:
+            COMPILED_LAYOUTS.popitem(last=False)
+    return compiled
+
+
+class FigureBuilder:
+    """
+    Builds a plotter's figures from trace dicts and layout keyword arguments.
+
+    With validate=True every trace and the layout go through plotly's validating constructors and
+    update_layout, as before. With validate=False the layout arguments (everything except per-call
+    data arrays) are validated once per process by compile_layout and kept as plain plotly JSON, and
+    each figure is assembled from that, the per-call data and the trace dicts without validation. Both
+    produce the same figure; the unvalidated path skips most of plotly's per-call overhead but does
+    not catch invalid properties, so it suits plotters whose arguments are already known to work.
+
+    Parameters:
+    -----------
+    validate : bool, optional, default=True
+        Whether each figure is validated by plotly.
+    """
+
+    def __init__(self, validate=True):
+        self.validate = validate
+
+    def figure(self, traces, layout, data_layout=None):
+        """
+        Returns a go.Figure with traces (dicts with a 'type'), laid out by update_layout(**layout)
+        followed by update_layout(data_layout), which holds the parts that depend on the data.
+        """
+        if self.validate:
+            fig = go.Figure(data=traces)
+            fig.update_layout(**layout)
+            if data_layout:
+                fig.update_layout(data_layout)
+            return fig
+        # go.Figure copies the dicts it is given, so the shared compiled layout is never modified
+        compiled = compile_layout(layout)
+        if data_layout:
+            compiled = merge_layout(compiled, plain(data_layout))
+        return go.Figure(dict(data=[plain(t) for t in traces], layout=compiled), _validate=False)
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+
+
+class FilterIndex:
+    """
+    Lazily built value -> code lookup for the low-cardinality columns of one DataFrame.
+
+    The first filter on a column factorizes it once and keeps the (small integer) codes, so later
+    isin checks become a lookup into a boolean table indexed by code instead of a hash lookup of
+    every row. Categorical columns already carry codes and are never cached. The index assumes
+    the frame is not modified after it is built.
+
+    Parameters:
+    -----------
+    df : pandas.DataFrame
+        The frame whose columns are indexed.
+    max_ratio : float, optional, default=0.5
+        Columns with more distinct values than this fraction of the rows are not cached.
+    """
+
+    def __init__(self, df, max_ratio=0.5):
+        self.df = df
+        self.max_ratio = max_ratio
+        self.codes = {}
+
+    def get(self, col):
+        """Returns (codes, uniques) for col, or None when col is not worth indexing."""
+        if col not in self.codes:
+            if isinstance(self.df[col].dtype, pd.CategoricalDtype):
+                return None
+            codes, uniques = pd.factorize(self.df[col])
+            if len(uniques) > self.max_ratio * len(codes) or len(uniques) >= np.iinfo('int32').max:
+                self.codes[col] = None
+            else:
+                dtype = 'int8' if len(uniques) < 127 else 'int16' if len(uniques) < 32_767 else 'int32'
+                self.codes[col] = (codes.astype(dtype), pd.Index(uniques))
+        return self.codes[col]
+
+
+def isin_mask(series, values, codes=None, uniques=None):
+    """Boolean ndarray equivalent to series.isin(values), using category codes when available."""
+    values = pd.Index(list(values))
+    # One slot per code plus a trailing slot for missing values (code -1)
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Matches Categorical.isin, which also resolves the values against the categories
+        codes, categories = series.cat.codes.to_numpy(), series.cat.categories
+        positions = categories.get_indexer(values)
+        lookup = np.zeros(len(categories) + 1, dtype=bool)
+        lookup[positions[positions >= 0]] = True
+    elif codes is None:
+        return series.isin(values).to_numpy()
+    else:
+        # isin on the uniques rather than get_indexer, which would parse strings against a datetime index
+        lookup = np.append(uniques.isin(values), False)
+    lookup[-1] = bool(values.isna().any())
+    return lookup[codes]
+
+def filter_mask(df, filters, index=None, rows=None):
+    """
+    Combines all filters into one boolean mask over df (isin within a column, AND across columns).
+
+    index is an optional FilterIndex built for a parent frame; rows then holds the positions (or
+    slice) of df within that parent so the cached codes can be reused.
+    """
+    mask = np.ones(len(df), dtype=bool)
+    for col, values in filters.items():
+        cached = index.get(col) if index is not None else None
+        if cached is not None:
+            codes = cached[0] if rows is None else cached[0][rows]
+            mask &= isin_mask(df[col], values, codes, cached[1])
+        else:
+            mask &= isin_mask(df[col], values)
+    return mask
@@ -0,0 +1,148 @@
+import hashlib
+from datetime import datetime, timedelta
+import pandas as pd
+from .DateRollup import partial_aggregate, finalize_partials
+
+
+def _import_dataset():
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+    except ImportError as e:
+        raise ImportError("ParquetSource requires the pyarrow package (pip install pyarrow).") from e
+    return pa, ds
+
+
+class ParquetSource:
+    """
+    A (partitioned) Parquet dataset, read lazily per plot() call.
+
+    Every plot() call reads only the columns it needs (date, targets, counts, segment) and pushes
+    the days_back window and the filters down to pyarrow.dataset as one filter expression, so
+    partitions outside the window are never opened and row groups are skipped using their
+    min/max statistics. Like a DateRollup, a ParquetSource can be passed to any DatePlotter
+    subclass or to CatBarPlot in place of a DataFrame (see also from_parquet on both).
+
+    Parameters:
+    -----------
+    path : str or list
+        A Parquet file, a directory of Parquet files or a list of files.
+    partitioning : str, optional, default='hive'
+        How directory names map to columns, as in pyarrow.dataset.dataset ('hive' for key=value).
+    date_partition : str, optional, default=None
+        A partition column holding the day (e.g. 'dt' in dt=2024-01-31/) when it differs from
+        plot()'s date_col; the days_back window is then also applied to it so whole
+        directories are pruned.
+    """
+
+    def __init__(self, path, partitioning='hive', date_partition=None):
+        pa, ds = _import_dataset()
+        self.dataset = ds.dataset(path, format='parquet', partitioning=partitioning)
+        self.schema = self.dataset.schema
+        self.columns = list(self.schema.names)
+        self.date_partition = date_partition
+
+    def fingerprint(self):
+        """The path, size and modification time of every file, so rewritten files invalidate the plot() cache."""
+        infos = self.dataset.filesystem.get_file_info(self.dataset.files)
+        token = repr([(i.path, i.size, i.mtime_ns) for i in infos] + [self.date_partition])
+        return hashlib.blake2b(token.encode(), digest_size=16).hexdigest()
+
+    def _check_columns(self, cols):
+        for col in cols:
+            if col not in self.columns:
+                raise ValueError(f"Column '{col}' not found in DataFrame.")
+
+    def _date_predicate(self, col, start_date, end_date):
+        # start_date <= col <= end_date, with the bounds converted to the column's own type
+        pa, ds = _import_dataset()
+        field_type = self.schema.field(col).type
+        if pa.types.is_string(field_type) or pa.types.is_large_string(field_type):
+            # ISO strings compare like the dates they hold
+            lo, hi = str(pd.Timestamp(start_date)), str(pd.Timestamp(end_date))
+        elif pa.types.is_date(field_type):
+            # A day is kept if its midnight falls inside the window
+            lo = (pd.Timestamp(start_date) - timedelta(microseconds=1)).ceil('D').date()
+            hi = end_date.date()
+        elif pa.types.is_timestamp(field_type):
+            lo = pa.scalar(start_date, type=pa.timestamp('us', field_type.tz)).cast(field_type, safe=False)
+            hi = pa.scalar(end_date, type=pa.timestamp('us', field_type.tz)).cast(field_type, safe=False)
+        else:
+            raise ValueError(f"Column '{col}' must hold dates, timestamps or ISO date strings.")
+        return (ds.field(col) >= lo) & (ds.field(col) <= hi)
+
+    def _partition_predicate(self, start_date, end_date):
+        # The whole day of each bound, so any row of the window keeps its partition
+        pa, ds = _import_dataset()
+        field_type = self.schema.field(self.date_partition).type
+        if pa.types.is_string(field_type) or pa.types.is_large_string(field_type):
+            lo, hi = start_date.date().isoformat(), end_date.date().isoformat()
+            return (ds.field(self.date_partition) >= lo) & (ds.field(self.date_partition) <= hi)
+        start_day = datetime.combine(start_date.date(), datetime.min.time())
+        end_day = datetime.combine(end_date.date(), datetime.min.time())
+        return self._date_predicate(self.date_partition, start_day, end_day)
+
+    def _filter_expression(self, filters):
+        # isin within a column, AND across columns; a missing value in the list also keeps nulls
+        pa, ds = _import_dataset()
+        expr = None
+        for col, values in (filters or {}).items():
+            values = list(values)
+            kept = [v.item() if hasattr(v, 'item') else v for v in values if v is not None and v == v]
+            cond = ds.field(col).isin(pa.array(kept, type=self.schema.field(col).type))
+            if len(kept) < len(values):
+                cond = cond | ds.field(col).is_null()
+            expr = cond if expr is None else expr & cond
+        return expr
+
+    def read(self, columns, filters=None, days_back=None, date_col=None, now=None):
+        """Reads columns for the rows matching filters and, with date_col, the days_back window."""
+        predicates = [self._filter_expression(filters)]
+        if days_back is not None:
+            end_date = now or datetime.now()
+            start_date = end_date - timedelta(days=days_back)
+            predicates.append(self._date_predicate(date_col, start_date, end_date))
+            if self.date_partition is not None and self.date_partition != date_col:
+                predicates.append(self._partition_predicate(start_date, end_date))
+
+        expr = None
+        for p in predicates:
+            if p is not None:
+                expr = p if expr is None else expr & p
+        columns = list(dict.fromkeys(columns))
+        return self.dataset.to_table(columns=columns, filter=expr).to_pandas()
+
+    def daily(self, date_col, filters=None, days_back=None, by=None, sums=(), means=(), weighted=(), every='1d',
+              now=None):
+        """
+        Returns final daily values, with the same columns as DateRollup.daily: the day, the by
+        columns, every sums column as its sum, every means column as its mean and every
+        (value, weight) pair in weighted as sum(value*weight) / sum(weight). every='1h' buckets
+        by hour instead of by day. now, if given, replaces the current time as the end of days_back.
+        """
+        by = list(by or [])
+        values = list(sums) + list(means) + [c for pair in weighted for c in pair]
+        self._check_columns([date_col] + list(filters or {}) + by + values)
+
+        df = self.read([date_col] + by + values, filters, days_back, date_col, now)
+        bucket = pd.to_datetime(df[date_col]).dt.floor('h' if every == '1h' else 'D').rename(date_col)
+        partials = partial_aggregate(df, [bucket] + by, sum_cols=list(dict.fromkeys(list(sums) + list(means))),
+                                     count_cols=means, weighted=weighted)
+        return finalize_partials(partials, [date_col] + by, sums, means, weighted)
+
+    def aggregate(self, keys, value_col, agg='sum', filters=None, weight_col=None):
+        """
+        Groups the filtered rows by keys (a dict of output name -> column) and reduces value_col
+        into a 'value' column with the pandas aggregation agg, or to its weighted mean by weight_col.
+        """
+        self._check_columns(list(keys.values()) + [value_col] + ([weight_col] if weight_col else []))
+        df = self.read(list(keys.values()) + [value_col] + ([weight_col] if weight_col else []), filters)
+
+        out = pd.DataFrame({name: df[col] for name, col in keys.items()})
+        if weight_col is not None:
+            out = out.assign(_w=df[weight_col], _wv=df[value_col] * df[weight_col])
+            out = out.groupby(list(keys), as_index=False)[['_wv', '_w']].sum()
+            out['value'] = out['_wv'] / out['_w']
+            return out[list(keys) + ['value']]
+        out['value'] = df[value_col]
+        return out.groupby(list(keys), as_index=False)['value'].agg(agg)
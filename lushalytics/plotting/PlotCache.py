@@ -0,0 +1,194 @@
+import functools
+import hashlib
+import inspect
+import threading
+from collections import OrderedDict
+from datetime import timedelta
+import numpy as np
+import pandas as pd
+from .Profiler import profile_stage
+
+
+def frame_fingerprint(df, sample_rows=1024):
+    """
+    A cheap content fingerprint of a pandas DataFrame: its shape, columns and dtypes plus a hash of
+    up to sample_rows evenly spaced rows (always including the first and last). Returns None when
+    the values cannot be hashed.
+    """
+    n = len(df)
+    rows = np.unique(np.linspace(0, n - 1, min(n, sample_rows)).astype('int64')) if n else []
+    try:
+        hashed = pd.util.hash_pandas_object(df.iloc[rows], index=True).to_numpy()
+    except TypeError:
+        return None
+    layout = repr((df.shape, [str(c) for c in df.columns], [str(t) for t in df.dtypes]))
+    return hashlib.blake2b(hashed.tobytes() + layout.encode(), digest_size=16).hexdigest()
+
+def normalize_argument(value):
+    """Turns a plot() argument into a hashable, order-insensitive (for dicts and sets) key part."""
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), normalize_argument(v)) for k, v in value.items()))
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(repr(normalize_argument(v)) for v in value))
+    if isinstance(value, (list, tuple, np.ndarray, pd.Index, pd.Series)):
+        return tuple(normalize_argument(v) for v in value)
+    if isinstance(value, np.generic):
+        return value.item()
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+def _nbytes(value):
+    # Rough in-memory size of a figure's plotly JSON or of a frame, for size-based eviction
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, np.ndarray):
+        return value.nbytes if value.dtype != object else sum(_nbytes(v) for v in value.tolist())
+    if isinstance(value, dict):
+        return sum(_nbytes(v) for v in value.values()) + 64 * len(value)
+    if isinstance(value, (list, tuple)):
+        return sum(_nbytes(v) for v in value) + 8 * len(value)
+    if isinstance(value, str):
+        return len(value)
+    if hasattr(value, 'to_plotly_json'):
+        return _nbytes(value.to_plotly_json())
+    return 16
+
+
+class PlotCache:
+    """
+    A thread-safe LRU cache of plot() results, shared by any number of plotters.
+
+    Entries are keyed by the plotter class and title, a fingerprint of its data and the normalized
+    plot() arguments, including a 'now' pinned to now_resolution so that days_back windows resolve
+    identically within that interval. Each entry holds the built figure and the aggregated frame
+    (restored to the plotter's debug attribute on a hit). Create it once per process (e.g. with
+    st.cache_resource) and pass it to every plotter that should use it.
+
+    Parameters:
+    -----------
+    max_entries : int, optional, default=128
+        The most entries kept; the least recently used one is evicted beyond that.
+    max_bytes : int, optional, default=None
+        If given, least recently used entries are also evicted while the estimated total size of the
+        cached figures and frames exceeds this many bytes.
+    now_resolution : timedelta, optional, default=timedelta(minutes=1)
+        How far 'now' is rounded down when plot() is called without an explicit now.
+    """
+
+    def __init__(self, max_entries=128, max_bytes=None, now_resolution=timedelta(minutes=1)):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.now_resolution = now_resolution
+        self.entries = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def pinned_now(self):
+        """The current time rounded down to now_resolution."""
+        return pd.Timestamp.now().floor(self.now_resolution).to_pydatetime()
+
+    def get(self, key):
+        """Returns the cached value for key (marking it most recently used), or None."""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        """Stores value under key, then evicts least recently used entries beyond the limits."""
+        size = _nbytes(value)
+        with self.lock:
+            if key in self.entries:
+                self.nbytes -= self.entries.pop(key)[1]
+            self.entries[key] = (value, size)
+            self.nbytes += size
+            while len(self.entries) > 1 and (
+                    len(self.entries) > self.max_entries
+                    or (self.max_bytes is not None and self.nbytes > self.max_bytes)):
+                self.nbytes -= self.entries.popitem(last=False)[1][1]
+                self.evictions += 1
+
+    def clear(self):
+        """Drops every entry; the counters are kept."""
+        with self.lock:
+            self.entries.clear()
+            self.nbytes = 0
+
+    def stats(self):
+        """Hit, miss and eviction counters plus the current number of entries and estimated bytes."""
+        with self.lock:
+            return dict(hits=self.hits, misses=self.misses, evictions=self.evictions,
+                        entries=len(self.entries), nbytes=self.nbytes)
+
+
+def publish_result(plotter, frame):
+    # Sets the plotter's result_attr (a debugging aid, last writer wins across threads); never read back here
+    result_attr = getattr(plotter, 'result_attr', None)
+    if result_attr is not None:
+        setattr(plotter, result_attr, frame)
+
+
+def cached_plot(plot):
+    """
+    Wraps a plotter's plot() method so calls go through self.cache when one is set.
+
+    The wrapped method returns (figure, aggregated frame) and the wrapper returns the figure. The
+    frame is cached with the figure when the plotter names a result_attr, and is then set on that
+    attribute for inspection after the entry is stored; the cache entry itself is built only from
+    the call's own return value, so concurrent calls on one plotter cannot mix their results. The
+    plotter provides data_fingerprint() (None disables caching for that call). Returned figures are
+    copies, so callers can update them without touching the cached entry.
+    """
+    signature = inspect.signature(plot)
+
+    @functools.wraps(plot)
+    def wrapper(self, *args, **kwargs):
+        cache = getattr(self, 'cache', None)
+        if cache is None:
+            fig, frame = plot(self, *args, **kwargs)
+            publish_result(self, frame)
+            return fig
+
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        arguments = dict(bound.arguments)
+        del arguments['self']
+        if 'now' in arguments and arguments['now'] is None:
+            arguments['now'] = cache.pinned_now()
+
+        fingerprint = self.data_fingerprint()
+        if fingerprint is None:
+            fig, frame = plot(self, **arguments)
+            publish_result(self, frame)
+            return fig
+        key = (type(self).__name__, self.title_dict['text'], fingerprint, normalize_argument(arguments))
+
+        profiler = getattr(self, 'profiler', None)
+        with profile_stage(self, 'cache_get') as stage:
+            hit = cache.get(key)
+            if hit is not None:
+                fig, frame = hit
+                fig = type(fig)(fig)
+                frame = stage.out(frame.copy()) if frame is not None else None
+        if profiler is not None:
+            profiler.cache_hit(hit is not None)
+        if hit is None:
+            fig, frame = plot(self, **arguments)
+            if getattr(self, 'result_attr', None) is None:
+                frame = None
+            with profile_stage(self, 'cache_put'):
+                cache.put(key, (type(fig)(fig), frame.copy() if frame is not None else None))
+        publish_result(self, frame)
+        return fig
+
+    return wrapper
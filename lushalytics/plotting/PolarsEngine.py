@@ -0,0 +1,178 @@
+from datetime import datetime, timedelta
+import numpy as np
+from .PlotCache import frame_fingerprint
+
+ENGINES = ('pandas', 'polars')
+
+OUTPUTS = ('pandas', 'arrow')
+
+# Group aggregations the polars engine can run for CatBarPlot, by their pandas name
+POLARS_AGGS = ('sum', 'mean', 'median', 'min', 'max', 'count', 'std', 'var')
+
+
+def _import_polars():
+    try:
+        import polars as pl
+    except ImportError as e:
+        raise ImportError("engine='polars' requires the polars package (pip install polars).") from e
+    return pl
+
+def is_arrow_frame(data):
+    """True for polars DataFrames/LazyFrames and pyarrow Tables, detected without importing either."""
+    return type(data).__module__.split('.')[0] in ('polars', 'pyarrow')
+
+def resolve_engine(data, engine=None):
+    """
+    Returns the engine to use for data: engine itself if given, else 'polars' for polars/pyarrow
+    inputs and 'pandas' for everything else.
+    """
+    if engine is None:
+        engine = 'polars' if is_arrow_frame(data) else 'pandas'
+    if engine not in ENGINES:
+        raise ValueError(f"engine must be one of {', '.join(map(repr, ENGINES))}.")
+    return engine
+
+def to_pandas(data):
+    """Converts a polars or pyarrow input to a pandas DataFrame; pandas input is returned as is."""
+    if not is_arrow_frame(data):
+        return data
+    if hasattr(data, 'collect'):
+        data = data.collect()
+    return data.to_pandas()
+
+def to_output(df, output='pandas'):
+    """Returns an aggregate() result as a pandas DataFrame (output='pandas') or a pyarrow Table ('arrow')."""
+    if output == 'pandas':
+        return df
+    if output == 'arrow':
+        try:
+            import pyarrow as pa
+        except ImportError as e:
+            raise ImportError("output='arrow' requires the pyarrow package (pip install pyarrow).") from e
+        return pa.Table.from_pandas(df, preserve_index=False)
+    raise ValueError(f"output must be one of {', '.join(map(repr, OUTPUTS))}.")
+
+
+class PolarsEngine:
+    """
+    Runs the row-level stages of plot() as one lazy, multi-threaded polars query.
+
+    Filtering, date trimming, bucketing by day (or hour) and the grouped reductions all happen in
+    polars; only the aggregated result, at most one row per bucket and group, is converted to
+    pandas for the period and figure stages. Like a DateRollup, the date plotters read daily values
+    from it, so it serves as their data source when created with engine='polars'.
+
+    Parameters:
+    -----------
+    data : pandas.DataFrame, polars.DataFrame, polars.LazyFrame or pyarrow.Table
+        The raw data. pandas and pyarrow inputs are converted to a polars frame once.
+    """
+
+    def __init__(self, data):
+        pl = _import_polars()
+        if isinstance(data, (pl.DataFrame, pl.LazyFrame)):
+            frame = data
+        elif type(data).__module__.split('.')[0] == 'pyarrow':
+            frame = pl.from_arrow(data)
+        else:
+            frame = pl.from_pandas(data)
+        self.lazy = frame.lazy()
+        self._fingerprint = self._sample_fingerprint(frame)
+        self.schema = self.lazy.collect_schema()
+        self.columns = list(self.schema.names())
+
+    def _sample_fingerprint(self, frame):
+        # Sampled rows of a materialized frame; a LazyFrame cannot be fingerprinted without running it
+        pl = _import_polars()
+        if isinstance(frame, pl.LazyFrame):
+            return None
+        n = frame.height
+        rows = np.unique(np.linspace(0, n - 1, min(n, 1024)).astype('int64')) if n else []
+        sample = frame[rows].to_pandas()
+        fingerprint = frame_fingerprint(sample, sample_rows=len(sample))
+        return None if fingerprint is None else f'{fingerprint}:{n}'
+
+    def fingerprint(self):
+        """A cheap fingerprint of the data for the plot() cache, or None for LazyFrame inputs."""
+        return self._fingerprint
+
+    def _check_columns(self, cols):
+        for col in cols:
+            if col not in self.schema:
+                raise ValueError(f"Column '{col}' not found in DataFrame.")
+
+    def _filtered(self, filters):
+        # isin within a column, AND across columns; a missing value in the list also keeps nulls
+        pl = _import_polars()
+        query = self.lazy
+        for col, values in (filters or {}).items():
+            values = list(values)
+            kept = [v for v in values if v is not None and v == v]
+            cond = pl.col(col).is_in(kept)
+            if len(kept) < len(values):
+                cond = cond | pl.col(col).is_null()
+            query = query.filter(cond)
+        return query
+
+    def _datetimes(self, date_col):
+        pl = _import_polars()
+        dtype = self.schema[date_col]
+        if dtype == pl.String:
+            return pl.col(date_col).str.to_datetime()
+        if dtype == pl.Date:
+            return pl.col(date_col).cast(pl.Datetime('us'))
+        return pl.col(date_col)
+
+    def daily(self, date_col, filters=None, days_back=None, by=None, sums=(), means=(), weighted=(), every='1d',
+              now=None):
+        """
+        Returns final daily values, with the same columns as DateRollup.daily: the day, the by
+        columns, every sums column as its sum, every means column as its mean and every
+        (value, weight) pair in weighted as sum(value*weight) / sum(weight). every='1h' buckets
+        by hour instead of by day. now, if given, replaces the current time as the end of days_back.
+        """
+        pl = _import_polars()
+        by = list(by or [])
+        self._check_columns([date_col] + list(filters or {}) + by + list(sums) + list(means)
+                            + [c for pair in weighted for c in pair])
+
+        query = self._filtered(filters).with_columns(self._datetimes(date_col).alias(date_col))
+        if days_back is not None:
+            end_date = now or datetime.now()
+            start_date = end_date - timedelta(days=days_back)
+            query = query.filter(pl.col(date_col).is_between(start_date, end_date))
+
+        keys = [date_col] + by
+        # Later kinds win on a name clash, as in finalize_partials
+        aggs = {c: pl.col(c).sum() for c in sums}
+        aggs.update({c: pl.col(c).mean() for c in means})
+        aggs.update({v: (pl.col(v) * pl.col(w)).sum() / pl.col(w).sum() for v, w in weighted})
+        result = (query
+                  .with_columns(pl.col(date_col).dt.truncate(every))
+                  .drop_nulls(keys)
+                  .group_by(keys)
+                  .agg([expr.alias(name) for name, expr in aggs.items()])
+                  .sort(keys)
+                  .collect())
+        return result.to_pandas()
+
+    def aggregate(self, keys, value_col, agg='sum', filters=None, weight_col=None):
+        """
+        Groups the filtered rows by keys (a dict of output name -> column) and reduces value_col
+        into a 'value' column with agg, one of POLARS_AGGS, or to its weighted mean by weight_col.
+        """
+        pl = _import_polars()
+        self._check_columns(list(keys.values()) + [value_col] + ([weight_col] if weight_col else []))
+        if weight_col is None and agg not in POLARS_AGGS:
+            raise ValueError(f"agg must be one of {', '.join(map(repr, POLARS_AGGS))} with engine='polars'.")
+
+        if weight_col is not None:
+            value = (pl.col(value_col) * pl.col(weight_col)).sum() / pl.col(weight_col).sum()
+        else:
+            value = getattr(pl.col(value_col), agg)()
+        return (self._filtered(filters)
+                .group_by([pl.col(col).alias(name) for name, col in keys.items()])
+                .agg(value.alias('value'))
+                .sort(list(keys))
+                .collect()
+                .to_pandas())
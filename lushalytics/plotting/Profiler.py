@@ -0,0 +1,213 @@
+import functools
+import threading
+import time
+import tracemalloc
+from collections import deque
+import numpy as np
+
+
+def count_rows(rows):
+    """The number of rows in a frame, a boolean mask, a slice of self.df's positions or a count."""
+    if rows is None or isinstance(rows, (int, np.integer)):
+        return rows
+    if isinstance(rows, slice):
+        return int(rows.stop - rows.start)
+    if isinstance(rows, np.ndarray) and rows.dtype == bool:
+        return int(rows.sum())
+    if hasattr(rows, 'num_rows'):
+        return rows.num_rows
+    return len(rows)
+
+
+class StageStats:
+    """
+    The wall time, row counts and (with trace_memory) peak traced allocation of one pipeline stage.
+    depth is 0 for top-level stages and 1 more for each stage it ran inside of (e.g. the re-read of
+    the folded segments within a date plot's top_n stage); an outer stage's time includes its inner ones.
+    """
+
+    __slots__ = ('name', 'depth', 'seconds', 'rows_in', 'rows_out', 'peak_bytes')
+
+    def __init__(self, name, rows_in=None, depth=0):
+        self.name = name
+        self.depth = depth
+        self.seconds = None
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.peak_bytes = None
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return f'StageStats({", ".join(f"{k}={v!r}" for k, v in self.as_dict().items())})'
+
+
+class PlotProfile:
+    """The stages of one plot() or aggregate() call, in the order they started."""
+
+    def __init__(self, plotter, method):
+        self.plotter = plotter
+        self.method = method
+        self.stages = []
+        self.seconds = None
+        self.cache_hit = None
+        # The stages running right now, innermost last
+        self.active = []
+
+    def as_dict(self):
+        return dict(plotter=self.plotter, method=self.method, seconds=self.seconds, cache_hit=self.cache_hit,
+                    stages=[stage.as_dict() for stage in self.stages])
+
+    def table(self):
+        """The stages as a small fixed-width table, for logs and notebooks."""
+        lines = [f'{self.plotter}.{self.method}: {self.seconds * 1000:.1f} ms'
+                 + ('' if self.cache_hit is None else f' (cache {"hit" if self.cache_hit else "miss"})')]
+        for s in self.stages:
+            rows = f'{s.rows_in if s.rows_in is not None else "-":>10} -> {s.rows_out if s.rows_out is not None else "-":<10}'
+            peak = '' if s.peak_bytes is None else f' {s.peak_bytes / 2 ** 20:8.1f} MiB'
+            lines.append(f'  {"  " * s.depth + s.name:<20} {s.seconds * 1000:9.2f} ms {rows}{peak}')
+        return '\n'.join(lines)
+
+    def __repr__(self):
+        return self.table()
+
+
+class _Stage:
+    # Times one stage of the current call; out() records the rows it produced
+    def __init__(self, profiler, profile, name, rows_in):
+        self.profiler = profiler
+        self.profile = profile
+        self.stats = StageStats(name, count_rows(rows_in), len(profile.active))
+
+    def out(self, rows):
+        self.stats.rows_out = count_rows(rows)
+        return rows
+
+    def __enter__(self):
+        active = self.profile.active
+        self.profile.stages.append(self.stats)
+        if self.profiler.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if active:
+                # The enclosing stage keeps the peak it reached so far, which reset_peak() discards
+                active[-1]._peak = max(active[-1]._peak, peak)
+            tracemalloc.reset_peak()
+            self._base = self._peak = current
+        active.append(self)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.stats.seconds = time.perf_counter() - self._start
+        active = self.profile.active
+        active.pop()
+        if self.profiler.trace_memory:
+            self._peak = max(self._peak, tracemalloc.get_traced_memory()[1])
+            self.stats.peak_bytes = max(self._peak - self._base, 0)
+            if active:
+                active[-1]._peak = max(active[-1]._peak, self._peak)
+        return False
+
+
+class _NoStage:
+    # Stands in for _Stage when no profiler is set or no call is being profiled
+    def out(self, rows):
+        return rows
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+NO_STAGE = _NoStage()
+
+
+class Profiler:
+    """
+    Records, for every plot() and aggregate() call of the plotters it is given to, the wall time and
+    rows in and out of each pipeline stage (filtering, date trimming, aggregation, granularity
+    conversion, tooltips, figure construction, ...), and optionally the peak memory allocated by each.
+
+    Each finished call becomes a PlotProfile: it is passed to callback, if given (e.g. to forward the
+    numbers to a metrics system), and kept in profiles, the most recent first. A call that runs inside
+    another (plot() calling aggregate()) is part of the outer call's profile. One profiler can be
+    shared by several plotters and threads; each thread profiles its own calls.
+
+    Parameters:
+    -----------
+    callback : callable, optional, default=None
+        Called with each finished PlotProfile, in the thread that made the call.
+    trace_memory : bool, optional, default=False
+        If True, each stage also records peak_bytes, the most memory allocated through Python's
+        allocators during the stage (via tracemalloc, started if it is not running already). Tracing
+        slows the pipeline down noticeably and its peaks are process-wide, so use it while investigating.
+    keep : int, optional, default=100
+        How many of the latest profiles to keep in profiles.
+    """
+
+    def __init__(self, callback=None, trace_memory=False, keep=100):
+        self.callback = callback
+        self.trace_memory = trace_memory
+        self.profiles = deque(maxlen=keep)
+        self.lock = threading.Lock()
+        self._local = threading.local()
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @property
+    def last(self):
+        """The most recent PlotProfile, or None."""
+        with self.lock:
+            return self.profiles[0] if self.profiles else None
+
+    def _current(self):
+        return getattr(self._local, 'profile', None)
+
+    def stage(self, name, rows_in=None):
+        """A context manager timing one stage of the call being profiled in this thread."""
+        profile = self._current()
+        if profile is None:
+            return NO_STAGE
+        return _Stage(self, profile, name, rows_in)
+
+    def cache_hit(self, hit):
+        """Records whether the call being profiled was answered from the plot cache."""
+        profile = self._current()
+        if profile is not None:
+            profile.cache_hit = hit
+
+    def run(self, plotter, method, call):
+        """Runs call() as the profiled call plotter.method, unless a call is already being profiled."""
+        if self._current() is not None:
+            return call()
+        profile = PlotProfile(type(plotter).__name__, method)
+        self._local.profile = profile
+        start = time.perf_counter()
+        try:
+            result = call()
+        finally:
+            profile.seconds = time.perf_counter() - start
+            self._local.profile = None
+        with self.lock:
+            self.profiles.appendleft(profile)
+        if self.callback is not None:
+            self.callback(profile)
+        return result
+
+
+def profile_stage(plotter, name, rows_in=None):
+    """plotter.profiler.stage(name, rows_in), or a no-op stage when the plotter has no profiler."""
+    profiler = getattr(plotter, 'profiler', None)
+    return NO_STAGE if profiler is None else profiler.stage(name, rows_in)
+
+def profiled(method):
+    """Wraps a plotter method so each call is profiled by self.profiler when one is set."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        profiler = getattr(self, 'profiler', None)
+        if profiler is None:
+            return method(self, *args, **kwargs)
+        return profiler.run(self, method.__name__, lambda: method(self, *args, **kwargs))
+    return wrapper
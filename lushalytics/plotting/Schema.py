@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+
+
+def normalize_frame(df, dimensions=(), downcast=False):
+    """
+    Returns df with every dimensions column (labels, segments and filter columns) as a pandas
+    categorical and, if downcast, every integer column narrowed to the smallest signed integer type
+    that holds its values. Float columns keep float64, as float32 would change sums. df itself is
+    not modified; it is returned as is when nothing changes.
+    """
+    changes = {}
+    for col in dimensions:
+        if col not in df.columns:
+            raise ValueError(f"Column '{col}' not found in DataFrame.")
+        if not isinstance(df[col].dtype, pd.CategoricalDtype):
+            changes[col] = df[col].astype('category')
+    if downcast:
+        for col in df.columns:
+            if col not in changes and pd.api.types.is_integer_dtype(df[col].dtype):
+                changes[col] = pd.to_numeric(df[col], downcast='integer')
+    return df.assign(**changes) if changes else df
+
+def unify_categories(frames, cols):
+    """
+    frames with every column of cols that is categorical in any of them made categorical in all of
+    them, over the sorted union of their categories, so concatenating them keeps the column
+    categorical (pd.concat falls back to plain values when categories differ).
+    """
+    frames = list(frames)
+    for col in cols:
+        dtypes = [f[col].dtype for f in frames if col in f.columns]
+        if not any(isinstance(d, pd.CategoricalDtype) for d in dtypes):
+            continue
+        values = [f[col].cat.categories if isinstance(f[col].dtype, pd.CategoricalDtype) else pd.Index(f[col].dropna().unique())
+                  for f in frames if col in f.columns]
+        categories = values[0].append(values[1:]).unique()
+        try:
+            categories = categories.sort_values()
+        except TypeError:
+            pass
+        dtype = pd.CategoricalDtype(categories)
+        frames = [f.assign(**{col: f[col].astype(dtype)}) if col in f.columns and f[col].dtype != dtype else f
+                  for f in frames]
+    return frames
+
+def widen(series):
+    """series as int64 if it holds narrower integers, so products of downcast columns cannot overflow."""
+    dtype = series.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in 'iu' and dtype.itemsize < 8:
+        return series.astype('int64')
+    return series
+
+def as_str(series):
+    """
+    series.astype(str). A categorical column stays categorical with its categories converted
+    instead, which touches each distinct value once rather than every row; missing values stay
+    missing, as with pandas' str dtype.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = series.cat.categories.astype(str)
+        if categories.is_unique:
+            return series.cat.rename_categories(categories)
+    return series.astype(str)
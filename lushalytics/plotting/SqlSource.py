@@ -0,0 +1,237 @@
+import queue
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+import pandas as pd
+
+# Expressions that truncate a date column to a bucket, per dialect and bucket size
+BUCKETS = {
+    'duckdb': {'1d': "date_trunc('day', {col})", '1h': "date_trunc('hour', {col})"},
+    'sqlite': {'1d': "date({col})", '1h': "strftime('%Y-%m-%d %H:00:00', {col})"},
+}
+
+DRIVER_DIALECTS = {'duckdb': 'duckdb', 'sqlite3': 'sqlite'}
+
+# Group aggregations by their pandas name; median, std and var are DuckDB only
+SQL_AGGS = {
+    'sum': 'SUM', 'mean': 'AVG', 'min': 'MIN', 'max': 'MAX', 'count': 'COUNT',
+    'median': 'MEDIAN', 'std': 'STDDEV_SAMP', 'var': 'VAR_SAMP',
+}
+
+
+def quote(name):
+    """Quotes a column name as a SQL identifier."""
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+class SqlSource:
+    """
+    A table in a database, aggregated where it lives.
+
+    Every plot() call becomes one GROUP BY query whose WHERE clause holds the filters and the
+    days_back date range, so the database can prune rows and partitions; only the aggregated
+    rows, one per day (or hour) and group, are fetched. Like a DateRollup, a SqlSource can be
+    passed to any DatePlotter subclass or to CatBarPlot in place of a DataFrame.
+
+    Parameters:
+    -----------
+    connect : callable or DB-API connection
+        A zero-argument function returning a new DB-API connection (e.g. lambda: duckdb.connect(path)),
+        used to fill a pool of up to pool_size connections, one per concurrent plot() call. A single
+        connection object is also accepted and is then shared under a lock.
+    table : str
+        The table (or view) to read, or a parenthesized subquery with an alias.
+    dialect : str, optional, default=None
+        'duckdb' or 'sqlite', which decides how dates are bucketed. None detects it from the connection.
+    paramstyle : str, optional, default='qmark'
+        The driver's placeholder style: 'qmark' (?), 'format' (%s) or 'numeric' (:1).
+    pool_size : int, optional, default=4
+        The most connections kept open at once when connect is a function.
+    """
+
+    def __init__(self, connect, table, dialect=None, paramstyle='qmark', pool_size=4):
+        if paramstyle not in ('qmark', 'format', 'numeric'):
+            raise ValueError("paramstyle must be one of 'qmark', 'format', 'numeric'.")
+        self.table = table
+        self.paramstyle = paramstyle
+
+        self.pool = queue.LifoQueue(maxsize=pool_size)
+        self.slots = threading.BoundedSemaphore(pool_size)
+        # A connection has a cursor(); anything else is a factory (sqlite3 connections are callable too)
+        if hasattr(connect, 'cursor'):
+            self.connect = None
+            self.shared = connect
+            self.lock = threading.Lock()
+        else:
+            self.connect = connect
+            self.shared = None
+
+        with self.connection() as conn:
+            self.dialect = dialect or self._detect_dialect(conn)
+            cur = conn.cursor()
+            cur.execute(f"SELECT * FROM {self.table} WHERE 1 = 0")
+            self.columns = [d[0] for d in cur.description]
+            # Declared column types where the driver reports them (DuckDB does, sqlite does not)
+            self.types = {d[0]: str(d[1]).upper() for d in cur.description if d[1] is not None}
+            cur.close()
+        if self.dialect not in BUCKETS:
+            raise ValueError(f"dialect must be one of {', '.join(map(repr, BUCKETS))}.")
+
+    def _detect_dialect(self, conn):
+        module = type(conn).__module__.split('.')[0].lstrip('_')
+        if module in DRIVER_DIALECTS:
+            return DRIVER_DIALECTS[module]
+        raise ValueError(f"Cannot detect the SQL dialect of a '{module}' connection; pass dialect explicitly.")
+
+    @contextmanager
+    def connection(self):
+        """Checks a connection out of the pool (opening one if none is idle) and returns it afterwards."""
+        if self.shared is not None:
+            with self.lock:
+                yield self.shared
+            return
+        self.slots.acquire()
+        try:
+            try:
+                conn = self.pool.get_nowait()
+            except queue.Empty:
+                conn = self.connect()
+            try:
+                yield conn
+            finally:
+                self.pool.put_nowait(conn)
+        finally:
+            self.slots.release()
+
+    def close(self):
+        """Closes every idle pooled connection (a shared connection is left to its owner)."""
+        while True:
+            try:
+                self.pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def fingerprint(self):
+        """None: a database table can change at any time, so its plots are never cached."""
+        return None
+
+    def _check_columns(self, cols):
+        for col in cols:
+            if col not in self.columns:
+                raise ValueError(f"Column '{col}' not found in DataFrame.")
+
+    def _placeholder(self, params):
+        if self.paramstyle == 'qmark':
+            return '?'
+        if self.paramstyle == 'format':
+            return '%s'
+        return f':{len(params)}'
+
+    def _date_bounds(self, col, start_date, end_date):
+        # start_date <= col <= end_date, with the bounds in the column's own terms
+        if self.types.get(col) == 'DATE':
+            # A day is kept if its midnight falls inside the window
+            lo = (pd.Timestamp(start_date) - timedelta(microseconds=1)).ceil('D')
+            return lo.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')
+        # Timestamps compare as timestamps and ISO text as strings; the start in its shortest form
+        # keeps a date-only '2024-01-01' (or a whole-second value) starting the window inside it
+        start = pd.Timestamp(start_date)
+        if start == start.normalize():
+            lo = start.strftime('%Y-%m-%d')
+        elif start.microsecond == 0 and start.nanosecond == 0:
+            lo = start.strftime('%Y-%m-%d %H:%M:%S')
+        else:
+            lo = start.strftime('%Y-%m-%d %H:%M:%S.%f')
+        return lo, end_date.strftime('%Y-%m-%d %H:%M:%S.%f')
+
+    def _where(self, filters, params):
+        # isin within a column, AND across columns; a missing value in the list also keeps nulls
+        clauses = []
+        for col, values in (filters or {}).items():
+            values = list(values)
+            kept = [v for v in values if v is not None and v == v]
+            terms = []
+            if kept:
+                marks = []
+                for v in kept:
+                    params.append(v.item() if hasattr(v, 'item') else v)
+                    marks.append(self._placeholder(params))
+                terms.append(f"{quote(col)} IN ({', '.join(marks)})")
+            if len(kept) < len(values):
+                terms.append(f"{quote(col)} IS NULL")
+            clauses.append('(' + ' OR '.join(terms) + ')' if terms else '1 = 0')
+        return clauses
+
+    def _query(self, sql, params):
+        with self.connection() as conn:
+            cur = conn.cursor()
+            try:
+                cur.execute(sql, params)
+                rows = cur.fetchall()
+                columns = [d[0] for d in cur.description]
+            finally:
+                cur.close()
+        return pd.DataFrame(rows, columns=columns)
+
+    def daily(self, date_col, filters=None, days_back=None, by=None, sums=(), means=(), weighted=(), every='1d',
+              now=None):
+        """
+        Returns final daily values, with the same columns as DateRollup.daily: the day, the by
+        columns, every sums column as its sum, every means column as its mean and every
+        (value, weight) pair in weighted as sum(value*weight) / sum(weight). every='1h' buckets
+        by hour instead of by day. now, if given, replaces the current time as the end of days_back.
+        """
+        by = list(by or [])
+        self._check_columns([date_col] + list(filters or {}) + by + list(sums) + list(means)
+                            + [c for pair in weighted for c in pair])
+
+        params = []
+        where = self._where(filters, params)
+        if days_back is not None:
+            end_date = now or datetime.now()
+            start_date = end_date - timedelta(days=days_back)
+            lo, hi = self._date_bounds(date_col, start_date, end_date)
+            params.append(lo)
+            lo_mark = self._placeholder(params)
+            params.append(hi)
+            hi_mark = self._placeholder(params)
+            where.append(f"{quote(date_col)} >= {lo_mark} AND {quote(date_col)} <= {hi_mark}")
+
+        # Later kinds win on a name clash, as in finalize_partials
+        aggs = {c: f"SUM({quote(c)})" for c in sums}
+        aggs.update({c: f"AVG({quote(c)})" for c in means})
+        aggs.update({v: f"1.0 * SUM({quote(v)} * {quote(w)}) / SUM({quote(w)})" for v, w in weighted})
+
+        bucket = BUCKETS[self.dialect][every].format(col=quote(date_col))
+        keys = [date_col] + by
+        where += [f"{quote(k)} IS NOT NULL" for k in keys]
+        select = [f"{bucket} AS {quote(date_col)}"] + [quote(c) for c in by]
+        select += [f"{expr} AS {quote(name)}" for name, expr in aggs.items()]
+        positions = ', '.join(str(i + 1) for i in range(len(keys)))
+        sql = (f"SELECT {', '.join(select)} FROM {self.table} WHERE {' AND '.join(where)} "
+               f"GROUP BY {positions} ORDER BY {positions}")
+
+        out = self._query(sql, params)
+        out[date_col] = pd.to_datetime(out[date_col])
+        return out
+
+    def aggregate(self, keys, value_col, agg='sum', filters=None, weight_col=None):
+        """
+        Groups the filtered rows by keys (a dict of output name -> column) and reduces value_col
+        into a 'value' column with agg, one of SQL_AGGS, or to its weighted mean by weight_col.
+        """
+        self._check_columns(list(keys.values()) + [value_col] + ([weight_col] if weight_col else []))
+        if weight_col is None and agg not in SQL_AGGS:
+            raise ValueError(f"agg must be one of {', '.join(map(repr, SQL_AGGS))} with a SqlSource.")
+
+        if weight_col is not None:
+            value = f"1.0 * SUM({quote(value_col)} * {quote(weight_col)}) / SUM({quote(weight_col)})"
+        else:
+            value = f"{SQL_AGGS[agg]}({quote(value_col)})"
+        params = []
+        where = self._where(filters, params) or ['1 = 1']
+        select = [f"{quote(col)} AS {quote(name)}" for name, col in keys.items()]
+        positions = ', '.join(str(i + 1) for i in range(len(keys)))
+        sql = (f"SELECT {', '.join(select)}, {value} AS \"value\" FROM {self.table} "
+               f"WHERE {' AND '.join(where)} GROUP BY {positions}")
+        return self._query(sql, params)
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+
+
+def check_top_n(top_n):
+    if top_n is not None and (isinstance(top_n, bool) or not isinstance(top_n, (int, np.integer)) or top_n < 1):
+        raise ValueError("top_n must be a positive integer or None.")
+
+def top_n_positions(values, n):
+    """
+    Positions of the n largest values, largest first, found by partial selection (argpartition)
+    rather than a full sort; NaN values rank last.
+    """
+    values = np.asarray(values, dtype='float64')
+    keys = -np.where(np.isnan(values), -np.inf, values)
+    if n < len(values):
+        chosen = np.argpartition(keys, n - 1)[:n]
+    else:
+        chosen = np.arange(len(values))
+    return chosen[np.argsort(keys[chosen], kind='stable')]
+
+def top_n_keys(keys, values, n):
+    """The n keys with the largest values, largest first, or None if there are no more than n keys."""
+    keys = np.asarray(keys, dtype=object)
+    if len(keys) <= n:
+        return None
+    return keys[top_n_positions(values, n)].tolist()
+
+def check_other_label(series, other_label):
+    """Raises a ValueError if series already holds other_label, whose rows folding would mix into the tail."""
+    if series.isin([other_label]).any():
+        raise ValueError(f"other_label '{other_label}' is also a value of the folded column; pass another other_label.")
+
+def folded_order(top, other_label):
+    """
+    The segments left after folding, as strings: top in the sorted order of its original values
+    (the order unfolded segments take, so numbers sort as numbers), then other_label.
+    """
+    try:
+        top = sorted(top)
+    except TypeError:
+        top = sorted(top, key=str)
+    return list(dict.fromkeys(str(s) for s in top)) + [other_label]
+
+def fold_keys(series, top, other_label):
+    """
+    series with every value not in top replaced by other_label; missing values stay missing. Raises
+    a ValueError if series already holds other_label.
+    """
+    check_other_label(series, other_label)
+    if isinstance(series.dtype, pd.CategoricalDtype) and other_label not in series.cat.categories:
+        # Kept in sorted order, so groups come out in the same order as for plain columns
+        categories = series.cat.categories.append(pd.Index([other_label]))
+        try:
+            categories = categories.sort_values()
+        except TypeError:
+            pass
+        series = series.cat.set_categories(categories)
+    return series.where(series.isin(top) | series.isna(), other_label)
@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+
+
+def cycle_color(colors, i):
+    """The color of the i-th trace, starting over from the first color once the palette runs out."""
+    return colors[i % len(colors)]
+
+def segment_positions(df, segment_col, order=None):
+    """
+    Returns (segment, row positions) for every segment of df from a single groupby pass, instead of
+    one boolean filter over every row per segment. Segments come in order if given (skipping those
+    not in df), else in order of first appearance; positions keep the rows' order.
+    """
+    positions = df.groupby(segment_col, sort=False, observed=True).indices
+    if order is None:
+        order = list(positions)
+    return [(segment, positions[segment]) for segment in order if segment in positions]
+
+def dense_matrix(df, row_col, col_col, value_col, rows, cols, fill_value=0):
+    """
+    Pivots df, which holds at most one row per (row_col, col_col) pair, into a len(rows) x len(cols)
+    array of value_col in one vectorized pass. Pairs missing from df, and rows of df whose keys are not
+    in rows or cols, leave fill_value. Column j is then the trace of cols[j] across rows.
+    """
+    values = df[value_col].to_numpy()
+    dtype = values.dtype if np.issubdtype(values.dtype, np.number) else 'float64'
+    matrix = np.full((len(rows), len(cols)), fill_value, dtype=np.result_type(dtype, np.min_scalar_type(fill_value)))
+    r = pd.Index(rows).get_indexer(df[row_col])
+    c = pd.Index(cols).get_indexer(df[col_col])
+    found = (r >= 0) & (c >= 0)
+    matrix[r[found], c[found]] = values[found]
+    return matrix
@@ -4,4 +4,11 @@ from .DatePlotingClasses import (
     DateBarPlotter,
     LegendPlotter,
 )
-from .CategoricalBarPlot import CatBarPlot
\ No newline at end of file
+from .CategoricalBarPlot import CatBarPlot
+from .DateRollup import DateRollup
+from .SqlSource import SqlSource
+from .CategoryRollup import CategoryRollup
+from .ParquetSource import ParquetSource
+from .PlotCache import PlotCache
+from .DiskCache import DiskCache
+from .Profiler import Profiler
@@ -0,0 +1,56 @@
+import time
+import pandas as pd
+import numpy as np
+from datetime import datetime
+from lushalytics.plotting.DateRollup import DateRollup
+from lushalytics.plotting.DatePlotingClasses import DateLinePlotter
+
+import plotly.io as pio
+pio.renderers.default = "browser"
+
+# A dashboard refresh loop: two years of history, then small batches of new rows. Rebuilding
+# re-aggregates the whole history on every refresh; append() only re-merges the touched days.
+N_HISTORY = 5_000_000
+N_BATCH = 1_000
+N_REFRESHES = 5
+
+def make_rows(n, days):
+    date_range = pd.date_range(end=datetime.today(), periods=days).normalize()
+    return pd.DataFrame({
+        'date': np.random.choice(date_range, n),
+        'category': np.random.choice(['A', 'B', 'C', 'D'], n),
+        'value_1': np.random.normal(1900, 100, n),
+        'count_1': np.random.randint(1, 10, n),
+    })
+
+plot_args = dict(date_col='date', target_col='value_1', count_col='count_1', segment_col='category',
+                 aggregator='weighted_avg', period_aggregator='weighted_avg', granularity='weekly',
+                 incomplete_drop=True, days_back=90)
+
+np.random.seed(0)
+history = make_rows(N_HISTORY, 730)
+batches = [make_rows(N_BATCH, 1) for _ in range(N_REFRESHES)]
+
+start = time.perf_counter()
+data = history
+for batch in batches:
+    data = pd.concat([data, batch])
+    DateLinePlotter(DateRollup(data, 'date', ['category'], ['value_1'], ['count_1']), "Rebuilt").plot(**plot_args)
+print(f"rebuild per refresh: {(time.perf_counter() - start) / N_REFRESHES * 1000:,.0f} ms")
+
+plotter = DateLinePlotter(DateRollup(history, 'date', ['category'], ['value_1'], ['count_1']), "Weekly Weighted Value 1")
+start = time.perf_counter()
+for batch in batches:
+    plotter.append(batch)
+    fig = plotter.plot(**plot_args)
+print(f"append per refresh:  {(time.perf_counter() - start) / N_REFRESHES * 1000:,.0f} ms")
+fig.show()
+
+# The appended plotter matches one built fresh on all the rows
+fresh = DateLinePlotter(DateRollup(data, 'date', ['category'], ['value_1'], ['count_1']), "Weekly Weighted Value 1")
+fresh_fig = fresh.plot(**plot_args)
+appended, rebuilt = plotter.aggregate(**plot_args), fresh.aggregate(**plot_args)
+print("aggregate matches a fresh build:", appended[['period_start', 'category']].equals(rebuilt[['period_start', 'category']])
+      and np.allclose(appended[['value_1', 'count_1']].to_numpy(), rebuilt[['value_1', 'count_1']].to_numpy()))
+print("figure matches a fresh build:", len(fig.data) == len(fresh_fig.data) and all(
+    a.name == b.name and list(a.x) == list(b.x) and np.allclose(a.y, b.y) for a, b in zip(fig.data, fresh_fig.data)))
@@ -0,0 +1,73 @@
+import os
+import resource
+import tempfile
+import pandas as pd
+import numpy as np
+from datetime import datetime
+from lushalytics.plotting.DatePlotingClasses import DateLinePlotter, DateBarPlotter
+from lushalytics.plotting.CategoricalBarPlot import CatBarPlot
+
+import plotly.io as pio
+pio.renderers.default = "browser"
+
+# Plots built from a CSV read in chunks: only one chunk and the daily partials are in memory at a
+# time, so peak RSS should follow CHUNK_ROWS rather than N_ROWS. Run as a standalone script.
+
+N_ROWS = 5_000_000
+CHUNK_ROWS = 250_000
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+path = os.path.join(tempfile.mkdtemp(), 'events.csv')
+np.random.seed(0)
+date_range = pd.date_range(end=datetime.today(), periods=365).normalize()
+for i in range(N_ROWS // CHUNK_ROWS):
+    pd.DataFrame({
+        'date': np.random.choice(date_range, CHUNK_ROWS),
+        'category': np.random.choice(['A', 'B', 'C', 'D'], CHUNK_ROWS),
+        'value_1': np.random.normal(1900, 100, CHUNK_ROWS),
+        'count_1': np.random.randint(1, 10, CHUNK_ROWS),
+    }).to_csv(path, mode='a', header=(i == 0), index=False)
+
+baseline_mb = peak_rss_mb()
+
+line_plotter = DateLinePlotter.from_chunks(
+    pd.read_csv(path, chunksize=CHUNK_ROWS),
+    "Weekly Weighted Value 1 by Category",
+    date_col='date',
+    dimensions=['category'],
+    value_cols=['value_1'],
+    weight_cols=['count_1']
+)
+print(f"after streaming {N_ROWS:,} rows: +{peak_rss_mb() - baseline_mb:,.0f} MB peak RSS")
+
+f1 = line_plotter.plot(
+    date_col='date',
+    target_col='value_1',
+    count_col='count_1',
+    segment_col='category',
+    aggregator='weighted_avg',
+    period_aggregator='weighted_avg',
+    granularity='weekly',
+    days_back=180
+)
+f1.show()
+
+f2 = DateBarPlotter.from_chunks(
+    pd.read_csv(path, chunksize=CHUNK_ROWS, usecols=['date', 'category', 'value_1']),
+    "Monthly Value 1",
+    date_col='date',
+    dimensions=['category'],
+    value_cols=['value_1']
+).plot(date_col='date', target_col='value_1', segment_col='category', granularity='monthly', days_back=365)
+f2.show()
+
+f3 = CatBarPlot.from_chunks(
+    pd.read_csv(path, chunksize=CHUNK_ROWS),
+    "Weighted Value 1 by Category",
+    dimensions=['category'],
+    value_cols=['value_1'],
+    weight_cols=['count_1']
+).plot('category', 'value_1', agg='wmean:count_1', sorting='value')
+f3.show()
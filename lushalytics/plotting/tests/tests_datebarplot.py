@@ -56,4 +56,38 @@ f5 = plotter5.plot(
     days_back=14,
     y_range=[1500, 2300]
 )
-f5.show()
\ No newline at end of file
+f5.show()
+
+plotter6 = DateBarPlotter(df.copy(), "Quarterly Value 2 by Category")
+f6 = plotter6.plot(
+    date_col="date",
+    target_col="value_2",
+    segment_col="category",
+    granularity="quarterly",
+    days_back=90
+)
+f6.show()
+
+plotter7 = DateBarPlotter(df.copy(), "Weekly Count 1 (Weeks Starting Sunday)")
+f7 = plotter7.plot(
+    date_col="date",
+    target_col="count_1",
+    granularity="weekly-sun",
+    incomplete_drop=True,
+    days_back=60
+)
+f7.show()
+
+# Sub-daily events for the hourly view
+hourly_df = pd.DataFrame({
+    'date': pd.Timestamp.now() - pd.to_timedelta(np.random.randint(0, 3 * 24 * 3600, 2000), unit='s'),
+    'value_1': np.random.normal(1900, 100, 2000),
+})
+plotter8 = DateBarPlotter(hourly_df, "Hourly Value 1 (Last 3 Days)")
+f8 = plotter8.plot(
+    date_col="date",
+    target_col="value_1",
+    granularity="hourly",
+    days_back=3
+)
+f8.show()
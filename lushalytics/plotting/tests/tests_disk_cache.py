@@ -0,0 +1,40 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import pandas as pd
+import numpy as np
+from datetime import datetime
+from lushalytics.plotting import DateLinePlotter, DiskCache
+
+import plotly.io as pio
+pio.renderers.default = "browser"
+
+# A worker restart: a fresh process plots from the same data and finds the aggregated results
+# another process already wrote to the shared cache directory, instead of recomputing them.
+N = 2_000_000
+CACHE_DIR = os.path.join(tempfile.gettempdir(), 'lushalytics-plot-cache')
+
+np.random.seed(0)
+date_range = pd.date_range(end=datetime.today(), periods=365).normalize()
+df = pd.DataFrame({
+    'date': np.random.choice(date_range, N),
+    'category': np.random.choice(['A', 'B', 'C', 'D'], N),
+    'value_1': np.random.normal(1900, 100, N),
+    'count_1': np.random.randint(1, 10, N),
+})
+
+cache = DiskCache(CACHE_DIR, max_bytes=256 * 1024 ** 2)
+plot_args = dict(date_col='date', target_col='value_1', count_col='count_1', segment_col='category',
+                 aggregator='weighted_avg', period_aggregator='weighted_avg', granularity='weekly',
+                 incomplete_drop=True, days_back=90)
+
+start = time.perf_counter()
+f1 = DateLinePlotter(df, "Weighted Value 1 (Last 90 Days)", cache=cache).plot(**plot_args)
+print(f"pid {os.getpid()}: {(time.perf_counter() - start) * 1000:,.0f} ms, {cache.stats()}")
+
+if len(sys.argv) == 1:
+    # The same script in a second process reads this one's entry from disk
+    subprocess.run([sys.executable, __file__, 'worker'], check=True)
+    f1.show()
@@ -0,0 +1,43 @@
+import pandas as pd
+import numpy as np
+from datetime import datetime
+from lushalytics.plotting import DateLinePlotter
+
+import plotly.io as pio
+pio.renderers.default = "browser"
+
+# Two years of hourly values is over 17,000 points per line; max_points keeps each trace to a
+# screen's width of points chosen by LTTB, so peaks and dips survive while the payload shrinks.
+N = 500_000
+
+np.random.seed(0)
+now = pd.Timestamp(datetime.now())
+df = pd.DataFrame({
+    'date': now - pd.to_timedelta(np.random.randint(0, 730 * 24 * 3600, N), unit='s'),
+    'category': np.random.choice(['A', 'B'], N),
+    'value_1': np.random.normal(1900, 100, N),
+})
+
+plotter = DateLinePlotter(df, "Hourly Value 1 (1,400 points per line)")
+f1 = plotter.plot(
+    date_col='date',
+    target_col='value_1',
+    segment_col='category',
+    aggregator='avg',
+    granularity='hourly',
+    days_back=730,
+    max_points=1400
+)
+# The drawn traces are downsampled, the aggregated data is not
+print([len(trace.x) for trace in f1.data], len(plotter._test))
+f1.show()
+
+f2 = DateLinePlotter(df, "Hourly Value 1 (all points)").plot(
+    date_col='date',
+    target_col='value_1',
+    segment_col='category',
+    aggregator='avg',
+    granularity='hourly',
+    days_back=730
+)
+f2.show()
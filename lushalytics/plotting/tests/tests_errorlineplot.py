@@ -0,0 +1,66 @@
+import time
+import pandas as pd
+import numpy as np
+import plotly.graph_objects as go
+from datetime import datetime
+from lushalytics.plotting.DatePlotingClasses import ErrorDateLinePlotter
+
+import plotly.io as pio
+pio.renderers.default = "browser"
+
+TEST_PLOT = False
+BENCHMARK_CONNECTORS = True
+
+def make_df(periods, rows_per_period=20):
+    np.random.seed(0)
+    n = periods * rows_per_period
+    date_range = pd.date_range(end=datetime.today(), periods=periods).normalize()
+    return pd.DataFrame({
+        'date': np.random.choice(date_range, n),
+        'actual': np.random.normal(0.5, 0.1, n),
+        'pred': np.random.normal(0.5, 0.1, n),
+        'sample_size': np.random.randint(1, 2_000, n),
+    })
+
+def legacy_connectors(fig, agg_df, date_col, actual_col, pred_col):
+    # The previous implementation: one dotted trace per period
+    for i in range(len(agg_df)):
+        fig.add_trace(go.Scatter(
+            x=[agg_df[date_col].iloc[i], agg_df[date_col].iloc[i]],
+            y=[agg_df[actual_col].iloc[i], agg_df[pred_col].iloc[i]],
+            mode='lines',
+            line=dict(dash='dot', color='#4d4d4d'),
+            showlegend=False
+        ))
+
+if TEST_PLOT:
+    plotter = ErrorDateLinePlotter(make_df(90), "Actual vs Predicted")
+    f = plotter.plot(
+        date_col="date",
+        actual_col="actual",
+        pred_col="pred",
+        count_col="sample_size",
+        days_back=60
+    )
+    f.show()
+
+if BENCHMARK_CONNECTORS:
+    print(f"{'periods':>8} | {'legacy s':>9} | {'single s':>9} | {'legacy KB':>10} | {'single KB':>10}")
+    for periods in [30, 90, 365, 730]:
+        plotter = ErrorDateLinePlotter(make_df(periods), "Benchmark")
+        plotter.plot("date", "actual", "pred", "sample_size", days_back=periods)
+        agg_df = plotter._test
+
+        start = time.perf_counter()
+        legacy_fig = go.Figure()
+        legacy_connectors(legacy_fig, agg_df, "date", "actual", "pred")
+        legacy_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        single_fig = go.Figure()
+        single_fig.add_trace(plotter.error_connectors_trace(agg_df, "date", "actual", "pred"))
+        single_time = time.perf_counter() - start
+
+        legacy_kb = len(legacy_fig.to_json()) / 1024
+        single_kb = len(single_fig.to_json()) / 1024
+        print(f"{periods:>8} | {legacy_time:>9.3f} | {single_time:>9.3f} | {legacy_kb:>10.1f} | {single_kb:>10.1f}")
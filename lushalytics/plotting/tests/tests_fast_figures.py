@@ -0,0 +1,37 @@
+import time
+import pandas as pd
+import numpy as np
+from datetime import datetime
+from lushalytics.plotting import DateLinePlotter, DateBarPlotter
+
+import plotly.io as pio
+pio.renderers.default = "browser"
+
+# A dashboard page renders dozens of small charts, where building the plotly figure costs more
+# than the aggregation; validate=False skips plotly's per-call validation and gives the same figure.
+N = 20_000
+N_CHARTS = 50
+
+np.random.seed(0)
+date_range = pd.date_range(end=datetime.today(), periods=120).normalize()
+df = pd.DataFrame({
+    'date': np.random.choice(date_range, N),
+    'category': np.random.choice(['A', 'B', 'C', 'D'], N),
+    'value_1': np.random.normal(1900, 100, N),
+    'count_1': np.random.randint(1, 10, N),
+})
+
+plot_args = dict(date_col='date', target_col='value_1', count_col='count_1', segment_col='category',
+                 aggregator='weighted_avg', days_back=60)
+
+for validate in [True, False]:
+    start = time.perf_counter()
+    for _ in range(N_CHARTS):
+        f1 = DateLinePlotter(df, "Weighted Value 1", validate=validate).plot(**plot_args)
+    print(f"validate={validate}: {(time.perf_counter() - start) / N_CHARTS * 1000:,.1f} ms per chart")
+f1.show()
+
+f2 = DateBarPlotter(df, "Weekly Value 1", validate=False).plot(date_col='date', target_col='value_1',
+                                                                 segment_col='category', granularity='weekly',
+                                                                 days_back=90)
+f2.show()
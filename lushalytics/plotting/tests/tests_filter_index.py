@@ -0,0 +1,46 @@
+import pandas as pd
+import numpy as np
+from datetime import datetime
+from lushalytics.plotting import DateBarPlotter, CatBarPlot
+from lushalytics.plotting.FilterIndex import FilterIndex, filter_mask
+
+# Filters on low-cardinality columns go through cached factorized codes (categoricals through their
+# own codes); either way the mask must match a plain Series.isin on every column type.
+N = 100_000
+
+np.random.seed(0)
+now = pd.Timestamp(datetime.now()).floor('D')
+df = pd.DataFrame({
+    'date': now - pd.to_timedelta(np.random.randint(0, 30, N), unit='D'),
+    'region': np.random.choice(['north', 'south', 'east', None], N),
+    'store': np.random.randint(1, 50, N),
+    'channel': pd.Categorical(np.random.choice(['web', 'app', 'shop'], N)),
+    'revenue': np.random.gamma(2, 20, N),
+})
+
+index = FilterIndex(df)
+cases = [
+    {'date': [str(now.date())]},  # a string never equals a datetime, so nothing matches
+    {'date': [now, now - pd.Timedelta(days=3)]},
+    {'region': ['north', None]},
+    {'store': [1, 2.0, '3']},
+    {'channel': ['web', 'fax']},
+    {'region': ['south'], 'channel': ['app'], 'store': list(range(10))},
+    {'region': []},
+]
+for filters in cases:
+    expected = np.ones(len(df), dtype=bool)
+    for col, values in filters.items():
+        expected &= df[col].isin(values).to_numpy()
+    assert (filter_mask(df, filters, index) == expected).all(), filters
+    assert (filter_mask(df, filters) == expected).all(), filters
+assert index.get('date') is not None and index.get('channel') is None
+
+# The plotters apply the same masks
+date_filter = {'date': [str(now.date())]}
+assert CatBarPlot(df, "Revenue by Region").aggregate('region', 'revenue', filters=date_filter).empty
+kept = (df['region'] == 'north') & (df['channel'] == 'web')
+daily = DateBarPlotter(df, "Revenue", date_col='date').aggregate(
+    date_col='date', target_col='revenue', filters={'region': ['north'], 'channel': ['web']}, days_back=30
+)
+assert np.isclose(daily['revenue'].sum(), df.loc[kept, 'revenue'].sum())
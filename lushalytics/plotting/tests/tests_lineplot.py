@@ -84,6 +84,18 @@ f2 = plotter2.plot(
 )
 f2.show()
 
+# The same aggregation as a tidy table, without building the figure
+print(plotter2.aggregate(
+    date_col=date_col,
+    filters={'category':labels},
+    target_col=['value_1', 'value_2'],
+    count_col='count_1',
+    aggregator='weighted_avg',
+    granularity='weekly',
+    period_aggregator='weighted_avg',
+    count_period_aggregator='mean'
+))
+
 # # Weighted avg plot: monthly, 2 targets, 2 weights
 # plotter3 = DateLinePlotter(df.copy(), title)
 # f3 = plotter3.plot(
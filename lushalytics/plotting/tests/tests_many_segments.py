@@ -0,0 +1,35 @@
+import pandas as pd
+import numpy as np
+from datetime import datetime
+from lushalytics.plotting import DateLinePlotter, DateBarPlotter, CatBarPlot, LegendPlotter
+
+import plotly.io as pio
+pio.renderers.default = "browser"
+
+# Fifteen segments, more than the nine colors of the palette: every segment still gets a trace,
+# with the colors starting over after the ninth.
+N = 200_000
+
+np.random.seed(0)
+now = pd.Timestamp(datetime.now())
+segments = [f'store_{i:02d}' for i in range(15)]
+df = pd.DataFrame({
+    'date': now - pd.to_timedelta(np.random.randint(0, 30 * 24 * 3600, N), unit='s'),
+    'store': np.random.choice(segments, N),
+    'product': np.random.choice(['shoes', 'shirts', 'hats', 'bags', 'socks'], N),
+    'value': np.random.rand(N),
+})
+
+f1 = DateLinePlotter(df, "Value by Store").plot('date', 'value', segment_col='store', aggregator='sum')
+print(len(f1.data))
+f1.show()
+
+f2 = DateBarPlotter(df, "Value by Store").plot('date', 'value', segment_col='store')
+print(len(f2.data))
+f2.show()
+
+f3 = CatBarPlot(df, "Value by Product and Store").plot('product', 'value', segment='store', sorting='value')
+print(len(f3.data))
+f3.show()
+
+LegendPlotter(segments).get_legend_figure().show()
@@ -0,0 +1,46 @@
+import resource
+import pandas as pd
+import numpy as np
+from datetime import datetime
+from lushalytics.plotting.DatePlotingClasses import DateLinePlotter, DateBarPlotter
+from lushalytics.plotting.CategoricalBarPlot import CatBarPlot
+
+# Peak RSS across repeated plot() calls on plotters that wrap the input frame without copying
+# (copy=False). Run as a standalone script: ru_maxrss is a process-wide high-water mark, so the
+# zero-copy run must come before anything that copies the frame.
+
+N_ROWS = 5_000_000
+N_CALLS = 10
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+np.random.seed(0)
+date_range = pd.date_range(end=datetime.today(), periods=365).normalize()
+df = pd.DataFrame({
+    'date': np.random.choice(date_range, N_ROWS),
+    'category': pd.Categorical(np.random.choice(['A', 'B', 'C', 'D'], N_ROWS)),
+    'value_1': np.random.normal(1900, 100, N_ROWS),
+    'value_2': np.random.normal(200, 20, N_ROWS),
+    'count_1': np.random.randint(1, 10, N_ROWS),
+})
+
+input_mb = df.memory_usage(deep=True).sum() / 1024**2
+baseline_mb = peak_rss_mb()
+print(f"input frame: {input_mb:,.0f} MB | peak RSS before plotting: {baseline_mb:,.0f} MB")
+
+line_plotter = DateLinePlotter(df, "Memory", copy=False)
+bar_plotter = DateBarPlotter(df, "Memory", copy=False)
+cat_plotter = CatBarPlot(df, "Memory", copy=False)
+print(f"after zero-copy construction: +{peak_rss_mb() - baseline_mb:,.0f} MB")
+
+for i in range(N_CALLS):
+    line_plotter.plot('date', 'value_1', aggregator='sum', days_back=30, filters={'category': ['A', 'B']})
+    bar_plotter.plot('date', 'value_2', segment_col='category', granularity='weekly', days_back=90)
+    cat_plotter.plot('category', 'value_1', agg='sum')
+
+growth_mb = peak_rss_mb() - baseline_mb
+print(f"after {N_CALLS} rounds of plot(): +{growth_mb:,.0f} MB ({growth_mb / input_mb:.2f}x input)")
+
+copying_plotter = DateLinePlotter(df, "Memory")
+print(f"after one copying construction: +{peak_rss_mb() - baseline_mb:,.0f} MB")
@@ -0,0 +1,42 @@
+import pandas as pd
+import numpy as np
+from datetime import datetime
+from lushalytics.plotting import DateLinePlotter, CatBarPlot, DateRollup
+from lushalytics.plotting.Schema import normalize_frame
+
+import plotly.io as pio
+pio.renderers.default = "browser"
+
+# String-heavy dimension columns stored as categoricals and integer columns downcast once, when the
+# plotters are built; every plot() then filters and groups on category codes.
+N = 1_000_000
+
+np.random.seed(0)
+now = pd.Timestamp(datetime.now()).floor('D')
+df = pd.DataFrame({
+    'date': now - pd.to_timedelta(np.random.randint(0, 60, N), unit='D'),
+    'sku': np.random.choice([f'sku_{i:05d}' for i in range(5000)], N),
+    'region': np.random.choice(['north', 'south', 'east', 'west'], N),
+    'revenue': np.random.gamma(2, 20, N),
+    'orders': np.random.randint(1, 50, N),
+})
+
+cat_plotter = CatBarPlot(df, "Revenue by Region", dimensions=['sku', 'region'], downcast=True)
+print(df.memory_usage(deep=True).sum() // 2**20, "MiB ->", cat_plotter.df.memory_usage(deep=True).sum() // 2**20, "MiB")
+print(cat_plotter.df.dtypes)
+
+f1 = cat_plotter.plot('region', 'revenue', agg='wmean:orders', filters={'sku': [f'sku_{i:05d}' for i in range(50)]})
+f1.show()
+
+f2 = DateLinePlotter(df, "Revenue by Region", date_col='date', dimensions=['sku', 'region'], downcast=True).plot(
+    date_col='date', target_col='revenue', segment_col='region', aggregator='sum', days_back=60
+)
+f2.show()
+
+# A rollup of normalized rows keeps its categorical dimensions when plain new rows are appended
+rollup_plotter = DateLinePlotter(DateRollup(normalize_frame(df, ['region']), 'date', ['region'], ['revenue']),
+                                 "Revenue by Region")
+rollup_plotter.append(df.tail(1_000).assign(region='central'))
+assert isinstance(rollup_plotter.rollup.partials['region'].dtype, pd.CategoricalDtype)
+f3 = rollup_plotter.plot(date_col='date', target_col='revenue', segment_col='region', aggregator='sum', days_back=60)
+f3.show()
@@ -0,0 +1,53 @@
+import os
+import time
+import tempfile
+import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from datetime import datetime
+from lushalytics.plotting.DatePlotingClasses import DateLinePlotter, DateBarPlotter
+from lushalytics.plotting.CategoricalBarPlot import CatBarPlot
+
+import plotly.io as pio
+pio.renderers.default = "browser"
+
+# Cold start of a 30-day chart on two years of day-partitioned Parquet: reading everything into
+# pandas first versus from_parquet, which prunes partitions and reads only the needed columns
+N_ROWS = 5_000_000
+
+np.random.seed(0)
+date_range = pd.date_range(end=datetime.today(), periods=730).normalize()
+df = pd.DataFrame({
+    'date': np.random.choice(date_range, N_ROWS),
+    'category': np.random.choice(['A', 'B', 'C', 'D'], N_ROWS),
+    'value_1': np.random.normal(1900, 100, N_ROWS),
+    'value_2': np.random.normal(200, 20, N_ROWS),
+    'count_1': np.random.randint(1, 10, N_ROWS),
+    'notes': np.random.choice(['lorem ipsum', 'dolor sit amet'], N_ROWS),
+})
+root = os.path.join(tempfile.mkdtemp(), 'events')
+pq.write_to_dataset(pa.Table.from_pandas(df.assign(dt=df['date'].dt.strftime('%Y-%m-%d'))), root, partition_cols=['dt'])
+
+plot_args = dict(date_col='date', target_col='value_1', count_col='count_1', segment_col='category',
+                 aggregator='weighted_avg', filters={'category': ['A', 'B']}, days_back=30)
+
+start = time.perf_counter()
+DateLinePlotter(pd.read_parquet(root), "Full Read").plot(**plot_args)
+print(f"read everything: {time.perf_counter() - start:.2f}s")
+
+start = time.perf_counter()
+f1 = DateLinePlotter.from_parquet(root, "Weighted Value 1 (Last 30 Days)", date_partition='dt').plot(**plot_args)
+print(f"from_parquet:    {time.perf_counter() - start:.2f}s")
+f1.show()
+
+f2 = DateBarPlotter.from_parquet(root, "Weekly Value 2", date_partition='dt').plot(
+    date_col='date',
+    target_col='value_2',
+    granularity='weekly',
+    days_back=90
+)
+f2.show()
+
+f3 = CatBarPlot.from_parquet(root, "Value 1 by Category").plot('category', 'value_1', agg='mean', filters={'dt': [str(date_range[-1].date())]})
+f3.show()
@@ -0,0 +1,46 @@
+import time
+import pandas as pd
+import numpy as np
+from datetime import datetime
+from lushalytics.plotting import DateLinePlotter, CatBarPlot, PlotCache
+
+import plotly.io as pio
+pio.renderers.default = "browser"
+
+# A dashboard rerun: every widget change re-executes the script and calls plot() again with the
+# same data and mostly the same arguments. With a shared cache only the first call does the work.
+N = 2_000_000
+
+np.random.seed(0)
+date_range = pd.date_range(end=datetime.today(), periods=365).normalize()
+df = pd.DataFrame({
+    'date': np.random.choice(date_range, N),
+    'category': np.random.choice(['A', 'B', 'C', 'D'], N),
+    'value_1': np.random.normal(1900, 100, N),
+    'count_1': np.random.randint(1, 10, N),
+})
+
+cache = PlotCache(max_entries=64)
+plotter = DateLinePlotter(df, "Weighted Value 1 (Last 90 Days)", cache=cache)
+plot_args = dict(date_col='date', target_col='value_1', count_col='count_1', segment_col='category',
+                 aggregator='weighted_avg', period_aggregator='weighted_avg', granularity='weekly',
+                 incomplete_drop=True, days_back=90)
+
+start = time.perf_counter()
+f1 = plotter.plot(**plot_args)
+print(f"miss: {(time.perf_counter() - start) * 1000:,.0f} ms")
+
+start = time.perf_counter()
+f1 = plotter.plot(**plot_args)
+print(f"hit:  {(time.perf_counter() - start) * 1000:,.0f} ms")
+f1.show()
+
+# New data has a new fingerprint, so a plotter built on it recomputes
+updated = DateLinePlotter(pd.concat([df, df.tail(1_000)]), "Weighted Value 1 (Last 90 Days)", cache=cache)
+f2 = updated.plot(**plot_args)
+f2.show()
+
+f3 = CatBarPlot(df, "Value 1 by Category", cache=cache).plot('category', 'value_1', agg='mean')
+f3.show()
+
+print(cache.stats())
@@ -0,0 +1,47 @@
+import time
+import pandas as pd
+import numpy as np
+import polars as pl
+from datetime import datetime
+from lushalytics.plotting.DatePlotingClasses import DateLinePlotter, DateBarPlotter
+from lushalytics.plotting.CategoricalBarPlot import CatBarPlot
+
+import plotly.io as pio
+pio.renderers.default = "browser"
+
+# Same plot() arguments on the default pandas engine and on engine='polars'; the aggregated
+# values should match and the polars run should use every core
+N_ROWS = 2_000_000
+
+np.random.seed(0)
+date_range = pd.date_range(end=datetime.today(), periods=365).normalize()
+df = pd.DataFrame({
+    'date': np.random.choice(date_range, N_ROWS),
+    'category': np.random.choice(['A', 'B', 'C', 'D'], N_ROWS),
+    'value_1': np.random.normal(1900, 100, N_ROWS),
+    'count_1': np.random.randint(1, 10, N_ROWS),
+})
+
+line_args = dict(date_col='date', target_col='value_1', count_col='count_1', segment_col='category',
+                 aggregator='weighted_avg', period_aggregator='weighted_avg', granularity='weekly', days_back=180)
+
+for engine in ['pandas', 'polars']:
+    plotter = DateLinePlotter(df, f"Weekly Weighted Value 1 ({engine})", engine=engine)
+    start = time.perf_counter()
+    fig = plotter.plot(**line_args)
+    print(f"{engine}: {time.perf_counter() - start:.3f}s")
+    fig.show()
+
+# polars and pyarrow inputs go straight to the polars engine
+pl_df = pl.from_pandas(df)
+f2 = DateBarPlotter(pl_df, "Monthly Value 1 by Category (polars input)").plot(
+    date_col='date',
+    target_col='value_1',
+    segment_col='category',
+    granularity='monthly',
+    days_back=365
+)
+f2.show()
+
+f3 = CatBarPlot(pl_df.to_arrow(), "Mean Value 1 (pyarrow input)").plot('category', 'value_1', agg='mean', sorting='value')
+f3.show()
@@ -0,0 +1,58 @@
+import pandas as pd
+import numpy as np
+from datetime import datetime
+from lushalytics.plotting import DateLinePlotter, DateBarPlotter, CatBarPlot, PlotCache, Profiler
+
+import plotly.io as pio
+pio.renderers.default = "browser"
+
+# One profiler shared by several plotters: every plot() and aggregate() call records the wall time and
+# rows in and out of each pipeline stage, available as profiler.last / profiler.profiles or via a callback.
+N = 1_000_000
+
+np.random.seed(0)
+now = pd.Timestamp(datetime.now()).floor('D')
+df = pd.DataFrame({
+    'date': now - pd.to_timedelta(np.random.randint(0, 90, N), unit='D'),
+    'region': np.random.choice(['north', 'south', 'east', 'west'], N),
+    'channel': np.random.choice([f'channel_{i}' for i in range(25)], N),
+    'revenue': np.random.gamma(2, 20, N),
+    'orders': np.random.randint(1, 50, N),
+})
+
+profiler = Profiler(callback=lambda profile: print(f"{profile.plotter}.{profile.method}: {profile.seconds * 1000:.1f} ms"))
+
+line_plotter = DateLinePlotter(df, "Revenue by Channel", date_col='date', cache=PlotCache(), profiler=profiler)
+f1 = line_plotter.plot(date_col='date', target_col='revenue', segment_col='channel', aggregator='sum',
+                       granularity='weekly', days_back=90, top_n=5, max_points=50)
+f1.show()
+print(profiler.last)
+
+# A repeated call is answered from the cache
+line_plotter.plot(date_col='date', target_col='revenue', segment_col='channel', aggregator='sum',
+                  granularity='weekly', days_back=90, top_n=5, max_points=50)
+print(profiler.last)
+
+f2 = DateBarPlotter(df, "Orders by Region", profiler=profiler).plot(
+    date_col='date', target_col='orders', segment_col='region', filters={'channel': ['channel_1', 'channel_2']},
+    days_back=30
+)
+f2.show()
+print(profiler.last)
+
+# trace_memory adds each stage's peak allocation
+memory_profiler = Profiler(trace_memory=True)
+f3 = CatBarPlot(df, "Revenue by Channel", profiler=memory_profiler).plot(
+    'channel', 'revenue', agg='wmean:orders', segment='region', sorting='value', top_n=10
+)
+f3.show()
+print(memory_profiler.last)
+print(pd.DataFrame([stage.as_dict() for stage in memory_profiler.last.stages]))
+
+# Stages can nest (top_n re-reads the folded segments); an outer stage's peak covers its inner ones
+DateLinePlotter(df, "Revenue by Channel", profiler=memory_profiler).plot(
+    date_col='date', target_col='revenue', segment_col='channel', aggregator='avg', days_back=90, top_n=5
+)
+print(memory_profiler.last)
+top_n_stage = next(s for s in memory_profiler.last.stages if s.name == 'top_n')
+assert top_n_stage.peak_bytes >= max(s.peak_bytes for s in memory_profiler.last.stages if s.depth > 0)
@@ -0,0 +1,77 @@
+import pandas as pd
+import numpy as np
+from datetime import datetime
+from lushalytics.plotting.DateRollup import DateRollup
+from lushalytics.plotting.DatePlotingClasses import DateLinePlotter, DateBarPlotter, ErrorDateLinePlotter
+
+import plotly.io as pio
+pio.renderers.default = "browser"
+
+labels = ['A', 'B', 'C', 'D']
+
+# Toy dataset
+np.random.seed(0)
+date_range = pd.date_range(end=datetime.today(), periods=120)
+data = {
+    'date': np.random.choice(date_range, 5000),
+    'category': np.random.choice(labels, 5000),
+    'region': np.random.choice(['north', 'south'], 5000),
+    'value_1': np.random.normal(1900, 100, 5000),
+    'value_2': np.random.normal(200, 20, 5000),
+    'actual': np.random.normal(0.5, 0.1, 5000),
+    'pred': np.random.normal(0.5, 0.1, 5000),
+    'count_1': np.random.randint(1, 10, 5000),
+    'sample_size': np.random.randint(1, 2_000, 5000),
+}
+df = pd.DataFrame(data)
+
+# Built once, shared by every plotter below
+rollup = DateRollup(
+    df,
+    date_col='date',
+    dimensions=['category', 'region'],
+    value_cols=['value_1', 'value_2', 'actual', 'pred'],
+    weight_cols=['count_1', 'sample_size']
+)
+
+f1 = DateLinePlotter(rollup, "Weekly Weighted Value 1 by Category").plot(
+    date_col='date',
+    target_col='value_1',
+    count_col='count_1',
+    segment_col='category',
+    aggregator='weighted_avg',
+    period_aggregator='weighted_avg',
+    granularity='weekly',
+    days_back=90
+)
+f1.show()
+
+f2 = DateBarPlotter(rollup, "Monthly Value 2 (North)").plot(
+    date_col='date',
+    target_col='value_2',
+    filters={'region': ['north']},
+    granularity='monthly',
+    days_back=120
+)
+f2.show()
+
+f3 = ErrorDateLinePlotter(rollup, "Actual vs Predicted").plot(
+    date_col='date',
+    actual_col='actual',
+    pred_col='pred',
+    count_col='sample_size',
+    days_back=30
+)
+f3.show()
+
+# The rollup trims by whole days. Day-stamped rows are trimmed exactly like the raw frame; with intraday
+# rows and a mid-day now, the first, partial day of the raw window is left out and later days match
+now = pd.Timestamp('2024-03-10 12:00')
+kw = dict(date_col='date', target_col='value_1', aggregator='sum', days_back=7, now=now)
+for freq, first_day in [('D', pd.Timestamp('2024-03-04')), ('h', pd.Timestamp('2024-03-03'))]:
+    rows = pd.DataFrame({'date': pd.date_range('2024-02-01', now, freq=freq), 'category': 'A', 'value_1': 1.0})
+    rows_rollup = DateRollup(rows, date_col='date', dimensions=['category'], value_cols=['value_1'])
+    from_rollup = DateLinePlotter(rows_rollup, "Rollup").aggregate(**kw).groupby('date')['value_1'].sum()
+    from_raw = DateLinePlotter(rows, "Raw").aggregate(**kw).groupby('date')['value_1'].sum()
+    assert from_raw.index[0] == first_day and from_rollup.index[0] == pd.Timestamp('2024-03-04')
+    assert from_rollup.equals(from_raw[from_raw.index >= pd.Timestamp('2024-03-04')])
@@ -0,0 +1,107 @@
+import os
+import sqlite3
+import tempfile
+import duckdb
+import pandas as pd
+import numpy as np
+from datetime import datetime
+from lushalytics.plotting.SqlSource import SqlSource
+from lushalytics.plotting.DatePlotingClasses import DateLinePlotter, DateBarPlotter, ErrorDateLinePlotter
+from lushalytics.plotting.CategoricalBarPlot import CatBarPlot
+
+import plotly.io as pio
+pio.renderers.default = "browser"
+
+labels = ['A', 'B', 'C', 'D']
+
+# Toy dataset, written to an on-disk DuckDB database and an sqlite file
+np.random.seed(0)
+date_range = pd.date_range(end=datetime.today(), periods=120).normalize()
+df = pd.DataFrame({
+    'date': np.random.choice(date_range, 5000),
+    'category': np.random.choice(labels, 5000),
+    'value_1': np.random.normal(1900, 100, 5000),
+    'actual': np.random.normal(0.5, 0.1, 5000),
+    'pred': np.random.normal(0.5, 0.1, 5000),
+    'count_1': np.random.randint(1, 10, 5000),
+    'sample_size': np.random.randint(1, 2_000, 5000),
+})
+
+tmp_dir = tempfile.mkdtemp()
+duckdb_path = os.path.join(tmp_dir, 'events.duckdb')
+with duckdb.connect(duckdb_path) as con:
+    con.register('df_view', df)
+    con.execute("CREATE TABLE events AS SELECT * FROM df_view")
+    # The same rows with a DATE-typed date column
+    con.execute("CREATE TABLE events_by_day AS SELECT * REPLACE (CAST(date AS DATE) AS date) FROM df_view")
+
+sqlite_path = os.path.join(tmp_dir, 'events.db')
+with sqlite3.connect(sqlite_path) as con:
+    df.to_sql('events', con, index=False)
+
+# Connections are opened on demand and pooled between plot() calls
+duck_source = SqlSource(lambda: duckdb.connect(duckdb_path, read_only=True), 'events')
+sqlite_source = SqlSource(lambda: sqlite3.connect(sqlite_path, check_same_thread=False), 'events')
+
+for name, source in [('duckdb', duck_source), ('sqlite', sqlite_source)]:
+    from_sql = DateLinePlotter(source, f"Weekly Weighted Value 1 ({name})")
+    f1 = from_sql.plot(
+        date_col='date',
+        target_col='value_1',
+        count_col='count_1',
+        segment_col='category',
+        aggregator='weighted_avg',
+        period_aggregator='weighted_avg',
+        granularity='weekly',
+        filters={'category': ['A', 'B']},
+        days_back=90
+    )
+    f1.show()
+
+    from_frame = DateLinePlotter(df, "Reference")
+    from_frame.plot(
+        date_col='date',
+        target_col='value_1',
+        count_col='count_1',
+        segment_col='category',
+        aggregator='weighted_avg',
+        period_aggregator='weighted_avg',
+        granularity='weekly',
+        filters={'category': ['A', 'B']},
+        days_back=90
+    )
+    print(name, "matches the in-memory plot:",
+          np.allclose(from_sql._test['value_1'].to_numpy(), from_frame._test['value_1'].to_numpy()))
+
+f2 = DateBarPlotter(duck_source, "Monthly Value 1 by Category").plot(
+    date_col='date',
+    target_col='value_1',
+    segment_col='category',
+    granularity='monthly',
+    days_back=120
+)
+f2.show()
+
+f3 = ErrorDateLinePlotter(sqlite_source, "Actual vs Predicted").plot(
+    date_col='date',
+    actual_col='actual',
+    pred_col='pred',
+    count_col='sample_size',
+    days_back=30
+)
+f3.show()
+
+# A DATE column keeps the same days of a window ending mid-day as the in-memory frame
+midday = pd.Timestamp(datetime.today()).normalize() + pd.Timedelta(hours=12)
+by_day_source = SqlSource(lambda: duckdb.connect(duckdb_path, read_only=True), 'events_by_day')
+from_dates = DateBarPlotter(by_day_source, "Daily Value 1").aggregate('date', 'value_1', days_back=90, now=midday)
+reference = DateBarPlotter(df, "Reference").aggregate('date', 'value_1', days_back=90, now=midday)
+print("DATE column matches the in-memory window:", len(from_dates) == len(reference)
+      and np.allclose(from_dates['value_1'].to_numpy(), reference['value_1'].to_numpy()))
+by_day_source.close()
+
+f4 = CatBarPlot(duck_source, "Weighted Value 1").plot('category', 'value_1', agg='wmean:count_1', sorting='value')
+f4.show()
+
+duck_source.close()
+sqlite_source.close()
@@ -0,0 +1,66 @@
+import pandas as pd
+import numpy as np
+from datetime import datetime
+from lushalytics.plotting import DateLinePlotter, DateBarPlotter, CatBarPlot
+
+import plotly.io as pio
+pio.renderers.default = "browser"
+
+# 2,000 SKUs: top_n keeps the largest ones and aggregates the rest as a single "Other" label or
+# segment, computed from the underlying rows so averages stay true averages.
+N = 500_000
+
+np.random.seed(0)
+now = pd.Timestamp(datetime.now()).floor('D')
+skus = [f'sku_{i:04d}' for i in range(2000)]
+df = pd.DataFrame({
+    'date': now - pd.to_timedelta(np.random.randint(0, 30, N), unit='D'),
+    'sku': np.random.choice(skus, N, p=np.random.dirichlet(np.ones(2000) * 0.3)),
+    'region': np.random.choice(['north', 'south', 'east', 'west'], N),
+    'revenue': np.random.gamma(2, 20, N),
+    'orders': np.random.randint(1, 20, N),
+})
+
+f1 = CatBarPlot(df, "Revenue by SKU").plot('sku', 'revenue', sorting='value', top_n=10)
+f1.show()
+
+f2 = CatBarPlot(df, "Average Revenue per Order by SKU and Region").plot(
+    'sku', 'revenue', agg='wmean:orders', segment='region', segment_mode='group', top_n=8, other_label='Rest'
+)
+f2.show()
+
+f3 = DateLinePlotter(df, "Average Revenue, Top SKUs").plot(
+    date_col='date', target_col='revenue', segment_col='sku', aggregator='avg', top_n=5
+)
+print([trace.name for trace in f3.data])
+f3.show()
+
+f4 = DateBarPlotter(df, "Revenue, Top SKUs").plot('date', 'revenue', segment_col='sku', top_n=5)
+f4.show()
+
+# A custom order lists the labels left after folding; "Other" goes last unless it is placed
+f5 = CatBarPlot(df, "Revenue by SKU, Custom Order").plot('sku', 'revenue', sorting=skus, top_n=10)
+print(list(f5.data[0].x))
+f5.show()
+
+# A real label named like other_label would be merged into the folded group, so it raises
+try:
+    CatBarPlot(df.assign(sku=df['sku'].replace('sku_0000', 'Other')), "Revenue by SKU").plot('sku', 'revenue', top_n=10)
+except ValueError as e:
+    print(e)
+
+# Numeric segments keep their numeric order after folding, with "Other" last
+stores = df.assign(store=np.random.randint(0, 15, N))
+for plotter, kw in [(DateLinePlotter(stores, "Revenue by Store"), dict(aggregator='sum')),
+                    (DateBarPlotter(stores, "Revenue by Store"), {})]:
+    names = [trace.name for trace in plotter.plot('date', 'revenue', segment_col='store', top_n=11, **kw).data]
+    assert names[-1] == 'Other' and names[:-1] == sorted(names[:-1], key=int), names
+
+# top_n folds segments, so it is rejected without a segment_col rather than ignored
+for plotter, kw in [(DateLinePlotter(df, "Revenue"), dict(aggregator='sum')), (DateBarPlotter(df, "Revenue"), {})]:
+    try:
+        plotter.plot('date', 'revenue', top_n=5, **kw)
+    except ValueError as e:
+        print(e)
+    else:
+        raise AssertionError("top_n without segment_col was accepted")
@@ -0,0 +1,49 @@
+import pandas as pd
+import numpy as np
+from datetime import datetime
+from lushalytics.plotting import DateLinePlotter, ErrorDateLinePlotter
+
+import plotly.io as pio
+pio.renderers.default = "browser"
+
+# Hourly data over three months is over 2,000 points per line, which SVG redraws slowly on every
+# hover and zoom; past WEBGL_POINTS the plotters switch to Scattergl on their own.
+N = 500_000
+
+np.random.seed(0)
+now = pd.Timestamp(datetime.now())
+df = pd.DataFrame({
+    'date': now - pd.to_timedelta(np.random.randint(0, 90 * 24 * 3600, N), unit='s'),
+    'category': np.random.choice(['A', 'B', 'C', 'D'], N),
+    'value_1': np.random.normal(1900, 100, N),
+    'actual': np.random.rand(N),
+    'pred': np.random.rand(N),
+    'sample_size': np.random.randint(1, 500, N),
+})
+
+f1 = DateLinePlotter(df, "Hourly Value 1 (WebGL)").plot(
+    date_col='date',
+    target_col='value_1',
+    segment_col='category',
+    aggregator='avg',
+    granularity='hourly',
+    days_back=90
+)
+print([trace.type for trace in f1.data])
+f1.show()
+
+# The same chart forced back to SVG
+f2 = DateLinePlotter(df, "Hourly Value 1 (SVG)").plot(
+    date_col='date',
+    target_col='value_1',
+    segment_col='category',
+    aggregator='avg',
+    granularity='hourly',
+    days_back=90,
+    webgl=False
+)
+f2.show()
+
+f3 = ErrorDateLinePlotter(df, "Hourly Error").plot('date', 'actual', 'pred', 'sample_size', granularity='hourly',
+                                                   days_back=90)
+f3.show()
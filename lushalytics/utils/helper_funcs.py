@@ -1,3 +1,8 @@
+import numpy as np
+import pandas as pd
+
+__all__ = ['format_num', 'format_num_array']
+
 def format_num(x, style='comma', decimals=1):
 
     if style == 'comma':
@@ -6,8 +11,8 @@ def format_num(x, style='comma', decimals=1):
         if decimals == 0:
             s = s.rstrip('0').rstrip('.') if '.' in s else s
         return s
-    
-    elif style == 'suffix': 
+
+    elif style == 'suffix':
 
         magnitude = 0
         while abs(x) >= 1000:
@@ -15,4 +20,74 @@ def format_num(x, style='comma', decimals=1):
             x /= 1000.0
 
         x = round(x, 0)
-        return '{}{}'.format('{:f}'.format(x).rstrip('0').rstrip('.'), ['', 'K', 'M', 'B', 'T'][magnitude])
\ No newline at end of file
+        return '{}{}'.format('{:f}'.format(x).rstrip('0').rstrip('.'), ['', 'K', 'M', 'B', 'T'][magnitude])
+
+def _round_like_python(values, decimals):
+    # np.round scales by 10**decimals before rounding, which can land on the wrong side of a
+    # tie that Python's correctly rounded round() resolves exactly. Only values whose scaled
+    # form sits at (or overflows near) .5 can differ, so just those go through round().
+    rounded = np.round(values, decimals)
+    with np.errstate(over='ignore', invalid='ignore'):
+        scaled = values * 10.0 ** decimals if decimals >= 0 else values / 10.0 ** -decimals
+        distance = np.abs(np.abs(scaled - np.floor(scaled)) - 0.5)
+        suspect = np.isfinite(values) & ~(distance > 4 * np.spacing(np.abs(scaled)))
+    for i in np.flatnonzero(suspect):
+        rounded[i] = round(float(values[i]), decimals)
+    return rounded
+
+def _round_int_like_python(values, decimals):
+    # round() leaves ints untouched for decimals >= 0 and rounds half to even otherwise
+    if decimals >= 0:
+        return values
+    q = 10 ** -decimals
+    floor = values // q
+    rem = values - floor * q
+    up = (2 * rem > q) | ((2 * rem == q) & (floor % 2 == 1))
+    return (floor + up) * q
+
+def format_num_array(x, style='comma', decimals=1):
+    """
+    Vectorized format_num for a pandas Series, NumPy array or list of numbers.
+
+    Returns formatted strings identical to calling format_num on every value: a Series with the
+    same index for Series input, an object ndarray otherwise. Rounding and the 'suffix' magnitude
+    (log10/floor instead of repeated division) are computed on the whole array at once.
+    """
+    index = x.index if isinstance(x, pd.Series) else None
+    values = np.asarray(x)
+    is_int = np.issubdtype(values.dtype, np.integer)
+
+    if style == 'comma':
+        if is_int:
+            out = [f'{v:,}' for v in _round_int_like_python(values, decimals).tolist()]
+        else:
+            out = [f'{v:,}' for v in _round_like_python(values.astype('float64'), decimals).tolist()]
+            if decimals == 0:
+                out = [s.rstrip('0').rstrip('.') if '.' in s else s for s in out]
+
+    elif style == 'suffix':
+        values = values.astype('float64')
+        magnitude = np.zeros(values.shape, dtype='int64')
+        with np.errstate(divide='ignore', invalid='ignore'):
+            large = np.abs(values) >= 1000
+            magnitude[large] = np.floor(np.log10(np.abs(values[large])) / 3).astype('int64')
+        # log10 can be off by one right at a power of 1000
+        magnitude -= (magnitude > 0) & (np.abs(values) < 1000.0 ** magnitude)
+        magnitude += np.abs(values) >= 1000.0 ** (magnitude + 1)
+
+        # Divide step by step like format_num does, so the scaled values match bit for bit
+        scaled = values.copy()
+        for step in range(int(magnitude.max(initial=0))):
+            scaled = np.where(magnitude > step, scaled / 1000.0, scaled)
+        carry = np.abs(scaled) >= 1000
+        scaled = np.where(carry, scaled / 1000.0, scaled)
+        magnitude += carry
+
+        suffixes = np.array(['', 'K', 'M', 'B', 'T'], dtype=object)[magnitude]
+        out = [f'{v:.0f}{s}' for v, s in zip(np.round(scaled, 0).tolist(), suffixes)]
+
+    else:
+        out = [None] * len(values)
+
+    out = np.array(out, dtype=object)
+    return pd.Series(out, index=index) if index is not None else out
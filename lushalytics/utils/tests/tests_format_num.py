@@ -0,0 +1,24 @@
+import time
+import numpy as np
+import pandas as pd
+from lushalytics.utils.helper_funcs import format_num, format_num_array
+
+N = 200_000
+
+np.random.seed(0)
+values = pd.Series(np.random.lognormal(8, 4, N) * np.random.choice([-1, 1], N))
+
+for style, decimals in [('comma', 1), ('comma', 0), ('suffix', 1)]:
+    subset = values[values.abs() < 1e15]
+
+    start = time.perf_counter()
+    scalar = [format_num(x, style, decimals) for x in subset]
+    scalar_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    vectorized = format_num_array(subset, style, decimals)
+    vectorized_time = time.perf_counter() - start
+
+    assert vectorized.tolist() == scalar, f"format_num_array differs from format_num for style={style}"
+    print(f"{style:>6} decimals={decimals} | scalar {scalar_time:.3f}s | vectorized {vectorized_time:.3f}s "
+          f"| {scalar_time / vectorized_time:.1f}x")